@@ -9,7 +9,7 @@ echo ╚════════════════════════
 echo.
 
 :: ── 0. Versiyon ──────────────────────────────────────────────────────────
-echo [1/4]  Reading version...
+echo [1/5]  Reading version...
 if not exist "VERSION.txt" echo 5.0 > VERSION.txt
 for /f "usebackq delims=" %%i in ("VERSION.txt") do set VERSION=%%i
 for /f "tokens=* delims= " %%x in ("%VERSION%") do set VERSION=%%x
@@ -20,7 +20,7 @@ powershell -NoProfile -ExecutionPolicy Bypass -Command "$f = Get-Content 'instal
 
 :: ── 1. Python DLL yolu ───────────────────────────────────────────────────
 echo.
-echo [2/4]  Locating Python runtime...
+echo [2/5]  Locating Python runtime...
 for /f "usebackq delims=" %%i in (
   `python -c "import sys,os; print(os.path.join(os.path.dirname(sys.executable),'python%PYTHON_VERSION_NODOT%.dll'))" 2^>nul`
 ) do set PYTHON_DLL=%%i
@@ -35,7 +35,7 @@ if exist "%PYTHON_DLL%" (
 
 :: ── 2. PyInstaller ───────────────────────────────────────────────────────
 echo.
-echo [3/4]  Building EXE with PyInstaller...
+echo [3/5]  Building EXE with PyInstaller...
 echo       (This may take 1-3 minutes)
 echo.
 
@@ -48,6 +48,14 @@ pyinstaller ^
     --add-data "steam_handler.py;." ^
     --add-data "ui.py;." ^
     --add-data "updater.py;." ^
+    --add-data "http_client.py;." ^
+    --add-data "metadata_store.py;." ^
+    --add-data "thumbnail_cache.py;." ^
+    --add-data "scheduler.py;." ^
+    --add-data "virtual_list.py;." ^
+    --add-data "search_index.py;." ^
+    --add-data "drm_status.py;." ^
+    --add-data "delta_patch.py;." ^
     --add-data "VERSION.txt;." ^
     --add-data "logo.ico;." ^
     --add-data "logo.png;." ^
@@ -65,6 +73,8 @@ pyinstaller ^
     --hidden-import=zipfile ^
     --hidden-import=tempfile ^
     --hidden-import=json ^
+    --hidden-import=lzma ^
+    --hidden-import=sqlite3 ^
     --hidden-import=tkinter ^
     --hidden-import=tkinter.ttk ^
     --hidden-import=tkinter.messagebox ^
@@ -95,7 +105,7 @@ echo       ✅ EXE built: dist\GameInSteam.exe
 echo.
 
 :: ── 3. Inno Setup ────────────────────────────────────────────────────────
-echo [4/4]  Building installer with Inno Setup...
+echo [4/5]  Building installer with Inno Setup...
 echo.
 
 set "ISCC="
@@ -128,7 +138,19 @@ if %ERRORLEVEL% NEQ 0 (
 echo.
 echo       ✅ Installer: Output\GameInSteam_Setup_v%VERSION%.exe
 
-:: ── 4. Temizlik ──────────────────────────────────────────────────────────
+:: ── 4. Delta güncellemeler ───────────────────────────────────────────────
+:: Output\ içindeki her eski installer'dan yenisine bir .delta üretilir;
+:: release'e Setup EXE ile birlikte yüklenir (updater kendi sürümününkini seçer).
+echo.
+echo [5/5]  Building delta updates...
+set "NEW_SETUP=Output\GameInSteam_Setup_v%VERSION%.exe"
+for %%F in ("Output\GameInSteam_Setup_v*.exe") do (
+  if /I not "%%~nxF"=="GameInSteam_Setup_v%VERSION%.exe" (
+    python delta_patch.py "%%F" "%NEW_SETUP%" "Output\%%~nF_to_v%VERSION%.delta"
+  )
+)
+
+:: ── 5. Temizlik ──────────────────────────────────────────────────────────
 echo.
 echo       Cleaning up build artifacts...
 if exist "build"             rmdir /s /q "build"             >nul 2>&1
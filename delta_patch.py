@@ -0,0 +1,165 @@
+"""
+GameInSteam — Binary delta patches
+Copy/insert deltas between two installers, standard library only. Release
+builds publish one next to the Setup EXE; the updater rebuilds the new
+installer from the one it already has and checks the SHA-256.
+
+Only works because installer.iss stores files uncompressed: PyInstaller
+already zlib-compresses every module on its own, so unchanged modules are
+the same bytes in both installers. A solid LZMA installer shares almost
+nothing with the previous one.
+
+    python delta_patch.py GameInSteam_Setup_v5.1.exe GameInSteam_Setup_v5.2.exe \\
+        GameInSteam_Setup_v5.1_to_v5.2.delta
+"""
+
+import hashlib
+import json
+import lzma
+import struct
+import sys
+import zlib
+
+MAGIC = b"GISDELTA1\n"
+BLOCK_SIZE = 4096       # match granularity of create_delta
+_MOD = 65521            # adler32 modulus
+_COPY, _INSERT = b"C", b"I"
+_COPY_FMT, _INSERT_FMT = ">QI", ">I"
+
+
+class DeltaError(ValueError):
+    """Malformed delta, or a base file it was not made from."""
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_delta(base_path: str, new_path: str, out_path: str,
+                 block: int = BLOCK_SIZE) -> int:
+    """
+    Writes the delta that turns base_path into new_path (rsync-style rolling
+    adler32 over block-aligned base chunks, matches extended forward).
+    Returns the delta size in bytes.
+    """
+    with open(base_path, "rb") as f:
+        base = f.read()
+    with open(new_path, "rb") as f:
+        new = f.read()
+
+    index: dict[int, int] = {}
+    for off in range(0, len(base) - block + 1, block):
+        index.setdefault(zlib.adler32(base[off:off + block]), off)
+
+    ops = bytearray()
+
+    def insert(start, end):
+        if end > start:
+            ops.extend(_INSERT + struct.pack(_INSERT_FMT, end - start) + new[start:end])
+
+    n, i, literal = len(new), 0, 0
+    weak = None
+    while i + block <= n:
+        if weak is None:
+            weak = zlib.adler32(new[i:i + block])
+        off = index.get(weak)
+        if off is not None and base[off:off + block] == new[i:i + block]:
+            length = block
+            while i + length + block <= n and off + length + block <= len(base) \
+                    and base[off + length:off + length + block] == new[i + length:i + length + block]:
+                length += block
+            while i + length < n and off + length < len(base) and base[off + length] == new[i + length]:
+                length += 1
+            insert(literal, i)
+            ops.extend(_COPY + struct.pack(_COPY_FMT, off, length))
+            i += length
+            literal, weak = i, None
+            continue
+        if i + block >= n:
+            break
+        # Roll the checksum one byte forward
+        out, inc = new[i], new[i + block]
+        a = ((weak & 0xFFFF) - out + inc) % _MOD
+        b = ((weak >> 16) - block * out - 1 + a) % _MOD
+        weak = (b << 16) | a
+        i += 1
+    insert(literal, n)
+
+    header = {"base_sha256": hashlib.sha256(base).hexdigest(),
+              "target_sha256": hashlib.sha256(new).hexdigest(),
+              "target_size": n}
+    with open(out_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(header).encode() + b"\n")
+        f.write(lzma.compress(bytes(ops), preset=9))
+        return f.tell()
+
+
+def read_header(delta_path: str) -> dict:
+    with open(delta_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise DeltaError("not a GameInSteam delta")
+        try:
+            return json.loads(f.readline())
+        except ValueError:
+            raise DeltaError("corrupt delta header")
+
+
+def apply_delta(base_path: str, delta_path: str, out_path: str) -> str:
+    """
+    Rebuilds the target from base_path into out_path and returns its SHA-256.
+    Raises DeltaError if base_path is not the file the delta was made from
+    or the result does not match the recorded target.
+    """
+    header = read_header(delta_path)
+    if _sha256_file(base_path) != header.get("base_sha256"):
+        raise DeltaError("base file does not match the delta")
+
+    with open(delta_path, "rb") as f:
+        f.seek(len(MAGIC))
+        f.readline()
+        try:
+            ops = lzma.decompress(f.read())
+        except lzma.LZMAError:
+            raise DeltaError("corrupt delta body")
+
+    digest = hashlib.sha256()
+    copy_size, insert_size = struct.calcsize(_COPY_FMT), struct.calcsize(_INSERT_FMT)
+    pos = 0
+    with open(base_path, "rb") as base, open(out_path, "wb") as out:
+        while pos < len(ops):
+            op = ops[pos:pos + 1]
+            pos += 1
+            if op == _COPY:
+                off, length = struct.unpack_from(_COPY_FMT, ops, pos)
+                pos += copy_size
+                base.seek(off)
+                chunk = base.read(length)
+                if len(chunk) != length:
+                    raise DeltaError("copy past the end of the base file")
+            elif op == _INSERT:
+                (length,) = struct.unpack_from(_INSERT_FMT, ops, pos)
+                pos += insert_size
+                chunk = ops[pos:pos + length]
+                pos += length
+            else:
+                raise DeltaError("unknown delta opcode")
+            out.write(chunk)
+            digest.update(chunk)
+        size = out.tell()
+
+    result = digest.hexdigest()
+    if size != header.get("target_size") or result != header.get("target_sha256"):
+        raise DeltaError("rebuilt file does not match the delta target")
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        sys.exit("usage: python delta_patch.py <old installer> <new installer> <out.delta>")
+    size = create_delta(*sys.argv[1:])
+    print(f"{sys.argv[3]}: {size:,} bytes")
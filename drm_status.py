@@ -0,0 +1,190 @@
+"""
+GameInSteam — DRM status service
+gamestatus.info lookups for library games: persisted (hits and misses) in the
+metadata store, refreshed in the background by one rate-limited worker.
+"""
+
+import threading
+import time
+from collections import deque
+
+import http_client  # type: ignore
+
+GAMESTATUS_URL = "https://gamestatus.info/back/api/gameinfo/game/"
+REQUESTS_PER_SEC = 2.0     # gamestatus.info is a small community API
+LOOKUP_TIMEOUT = 10
+
+HIT_SOURCE = "drm"         # {"cracked", "protection", "date"}
+MISS_SOURCE = "drm_miss"   # game not listed on gamestatus.info
+NOT_FOUND = {"found": False}
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart (single consumer)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    def wait(self, stop: threading.Event):
+        delay = self._next - time.monotonic()
+        if delay > 0:
+            stop.wait(delay)
+        self._next = max(self._next, time.monotonic()) + self.interval
+
+
+def lookup_drm_status(app_id, name: str = "", limiter=None, stop=None) -> dict:
+    """
+    Looks the game up by AppID, then by exact title.
+    Returns the status dict or NOT_FOUND; network errors propagate.
+    """
+    headers = {"User-Agent": "Mozilla/5.0"}
+    queries = [(str(app_id), lambda x: str(x.get("steam_prod_id")) == str(app_id))]
+    if name:
+        queries.append((name, lambda x: x.get("title", "").lower() == name.lower()))
+    for term, match in queries:
+        if limiter is not None:
+            limiter.wait(stop or threading.Event())
+        r = http_client.get(GAMESTATUS_URL, params={"search": term},
+                            headers=headers, timeout=LOOKUP_TIMEOUT)
+        data = next((x for x in r.json().get("results", []) if match(x)), None)
+        if data:
+            return {"cracked": bool(data.get("crack_date")),
+                    "protection": data.get("protections", "Unknown"),
+                    "date": data.get("crack_date") or "Uncracked"}
+    return dict(NOT_FOUND)
+
+
+class DrmStatusService:
+    """
+    In-memory view of every known DRM status, loaded from the store at startup
+    so categories are available before any network traffic.
+
+    request() queues an AppID when its status is unknown or past its TTL;
+    a single worker drains the queue at REQUESTS_PER_SEC and calls
+    on_update(app_id, status) from the worker thread. status is None when
+    the lookup failed and nothing is cached.
+
+    A miss is only persisted once the title fallback has run. Without a
+    name the miss stays in memory and name_resolved() queues the game again.
+    """
+
+    def __init__(self, store, names: dict | None = None, on_update=None,
+                 rate: float = REQUESTS_PER_SEC):
+        self._store = store
+        self._names = names if names is not None else {}
+        self.on_update = on_update
+        self._limiter = _RateLimiter(rate)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._queue: deque[str] = deque()
+        self._queued: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self._store_lock = threading.Lock()      # stop() waits for a running write
+        self._awaiting_name: set[str] = set()    # AppID-only misses, retried with the title
+
+        self.status: dict[str, dict] = {}
+        self._stale: set[str] = set()
+        for source in (MISS_SOURCE, HIT_SOURCE):   # a hit overrides an older miss
+            for aid, (value, stale) in store.get_many(source).items():
+                self.status[aid] = NOT_FOUND if source == MISS_SOURCE else value
+                if stale:
+                    self._stale.add(aid)
+                else:
+                    self._stale.discard(aid)
+
+    def get(self, app_id) -> dict | None:
+        return self.status.get(str(app_id))
+
+    def request(self, app_id, urgent: bool = False):
+        """Queues a lookup if the status is unknown or stale. urgent → front of the queue."""
+        aid = str(app_id)
+        with self._lock:
+            if aid in self.status and aid not in self._stale:
+                return
+            if aid in self._queued:
+                if urgent:
+                    self._queue.remove(aid)
+                    self._queue.appendleft(aid)
+                return
+            self._queued.add(aid)
+            (self._queue.appendleft if urgent else self._queue.append)(aid)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True,
+                                                name="drm-refresh")
+                self._thread.start()
+            self._wake.notify()
+
+    def refresh_many(self, app_ids):
+        """Background bulk refresh: queues every unknown / stale AppID behind urgent ones."""
+        for aid in app_ids:
+            self.request(aid)
+
+    def name_resolved(self, app_id):
+        """Queues the game again if its last lookup missed only because its name was unknown."""
+        aid = str(app_id)
+        with self._lock:
+            if aid not in self._awaiting_name:
+                return
+            self._awaiting_name.discard(aid)
+            self._stale.add(aid)
+        self.request(aid)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def stop(self, timeout: float = 2.0):
+        """Stops the worker and joins it. No store write happens after this returns."""
+        self._stop.set()
+        with self._lock:
+            self._queue.clear()
+            self._queued.clear()
+            self._wake.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._store_lock:   # a lookup still in flight after the timeout never writes
+            pass
+
+    # ── worker ───────────────────────────────────────────────────────────────
+    def _worker(self):
+        while not self._stop.is_set():
+            with self._lock:
+                while not self._queue and not self._stop.is_set():
+                    self._wake.wait()
+                if self._stop.is_set():
+                    return
+                aid = self._queue.popleft()
+                self._queued.discard(aid)
+            self._refresh(aid)
+
+    def _refresh(self, aid: str):
+        name = self._names.get(aid, "")
+        try:
+            st = lookup_drm_status(aid, name, self._limiter, self._stop)
+        except Exception:
+            st = None
+        # Without a name the title fallback did not run; the miss is not final
+        tentative = st == NOT_FOUND and not name
+        with self._lock:
+            self._stale.discard(aid)   # refresh once per session; unknown ones retry on request()
+            if tentative:
+                self._awaiting_name.add(aid)
+                self.status.setdefault(aid, NOT_FOUND)   # an older (stale) hit is kept
+            elif st is not None:
+                self.status[aid] = NOT_FOUND if st == NOT_FOUND else st
+        with self._store_lock:
+            if self._stop.is_set():
+                return
+            if st == NOT_FOUND and not tentative:
+                self._store.put(MISS_SOURCE, aid, True)
+                self._store.delete(HIT_SOURCE, aid)
+            elif st is not None and st != NOT_FOUND:
+                self._store.put(HIT_SOURCE, aid, st)
+                self._store.delete(MISS_SOURCE, aid)
+        if self.on_update:
+            self.on_update(aid, self.status.get(aid))
+        if tentative and self._names.get(aid):
+            self.name_resolved(aid)   # the name arrived while this lookup was running
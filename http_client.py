@@ -0,0 +1,143 @@
+"""
+GameInSteam — Shared HTTP client
+One pooled, keep-alive session used by steam_handler, updater and ui.
+"""
+
+import threading
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+USER_AGENT = "GameInSteam"
+
+# Hosts the app talks to, with the connection pool size for each one.
+# Card thumbnails and store lookups fan out the most, so they get the widest pools.
+HOST_POOL_SIZES = {
+    "store.steampowered.com": 16,
+    "cdn.akamai.steamstatic.com": 16,
+    "raw.githubusercontent.com": 8,
+    "api.github.com": 4,
+    "gamestatus.info": 8,
+}
+
+DEFAULT_POOL_CONNECTIONS = 10   # number of per-host pools kept alive
+DEFAULT_POOL_MAXSIZE = 8        # connections per pool for hosts not listed above
+DEFAULT_RETRIES = 1             # one retry covers keep-alive sockets closed by the server
+
+# Hit once in the background at startup so the first Add does not pay DNS + TLS setup.
+# api.github.com is left out: every request there counts against the 60/hour
+# unauthenticated limit, and the update check usually answers from its cache.
+PREWARM_URLS = (
+    "https://raw.githubusercontent.com/",
+    "https://store.steampowered.com/",
+    "https://cdn.akamai.steamstatic.com/",
+)
+
+_lock = threading.Lock()
+_session: "requests.Session | None" = None
+_settings = {
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "host_pool_sizes": dict(HOST_POOL_SIZES),
+}
+
+
+def _build_session() -> "requests.Session":
+    # requests is imported with the first session, not at app start (it is ~100 ms of imports)
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    s = requests.Session()
+    s.headers["User-Agent"] = USER_AGENT
+    default = HTTPAdapter(
+        pool_connections=_settings["pool_connections"],
+        pool_maxsize=_settings["pool_maxsize"],
+        max_retries=DEFAULT_RETRIES,
+    )
+    s.mount("https://", default)
+    s.mount("http://", default)
+    # Longest prefix wins in requests, so these override the default adapter per host
+    for host, size in _settings["host_pool_sizes"].items():
+        s.mount(f"https://{host}", HTTPAdapter(
+            pool_connections=1, pool_maxsize=size, max_retries=DEFAULT_RETRIES))
+    return s
+
+
+def configure(pool_connections: int | None = None, pool_maxsize: int | None = None,
+              host_pool_sizes: dict[str, int] | None = None):
+    """
+    Changes pool sizes. The current session is closed and rebuilt lazily
+    on the next request, so call this before prewarm().
+    """
+    global _session
+    with _lock:
+        if pool_connections:
+            _settings["pool_connections"] = int(pool_connections)
+        if pool_maxsize:
+            _settings["pool_maxsize"] = int(pool_maxsize)
+        if host_pool_sizes:
+            _settings["host_pool_sizes"].update(
+                {h: int(n) for h, n in host_pool_sizes.items() if n})
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+
+def get_session() -> "requests.Session":
+    """Returns the shared session, creating it on first use."""
+    global _session
+    s = _session
+    if s is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+            s = _session
+    return s
+
+
+def request(method: str, url: str, **kwargs) -> "requests.Response":
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> "requests.Response":
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs) -> "requests.Response":
+    return request("HEAD", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> "requests.Response":
+    return request("POST", url, **kwargs)
+
+
+def prewarm(urls=PREWARM_URLS, background: bool = True):
+    """
+    Opens one keep-alive connection per host so DNS and the TLS handshake
+    are already done when the first real request goes out.
+    Errors are ignored; a cold connection is only slower, never wrong.
+    """
+    def _warm(url):
+        try:
+            head(url, timeout=5, allow_redirects=False).close()
+        except Exception:
+            pass
+
+    if not background:
+        for url in urls:
+            _warm(url)
+        return
+    for url in urls:
+        threading.Thread(target=_warm, args=(url,), daemon=True,
+                         name=f"prewarm-{urlsplit(url).hostname}").start()
+
+
+def close():
+    """Closes every pooled connection (called on app exit)."""
+    global _session
+    with _lock:
+        old, _session = _session, None
+    if old is not None:
+        old.close()
@@ -1,7 +1,10 @@
+import time
+STARTED = time.perf_counter()   # time-to-interactive is measured from here (before the UI imports)
+
 from ui import main as start_app
 
 def main():
-    start_app()
+    start_app(STARTED)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,145 @@
+"""
+GameInSteam — Metadata store
+Persistent SQLite (WAL) cache for game names and DRM status,
+shared by the UI worker threads.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DAY = 86400
+
+# How long a value is considered fresh, per source. Stale values are still
+# returned (stale-while-revalidate); the caller refreshes them in the background.
+SOURCE_TTLS = {
+    "name":  30 * DAY,
+    "drm":    1 * DAY,
+    "drm_miss": 3 * DAY,   # not listed on gamestatus.info (negative cache)
+}
+DEFAULT_TTL = 1 * DAY
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    source  TEXT NOT NULL,
+    app_id  TEXT NOT NULL,
+    value   BLOB,
+    fetched REAL NOT NULL,
+    PRIMARY KEY (source, app_id)
+) WITHOUT ROWID
+"""
+
+
+class MetadataStore:
+    """
+    Key/value store keyed by (source, app_id).
+
+    Every thread gets its own connection; WAL mode lets readers run while a
+    writer commits, and busy_timeout absorbs short write contention.
+    bytes values are stored as-is, everything else as JSON.
+    """
+
+    def __init__(self, path: str, ttls: dict[str, float] | None = None):
+        self.path = path
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    # ── encoding ─────────────────────────────────────────────────────────────
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, (bytes, bytearray)):
+            return sqlite3.Binary(value)
+        return json.dumps(value)
+
+    @staticmethod
+    def _decode(raw):
+        if isinstance(raw, (bytes, memoryview)):
+            return bytes(raw)
+        return json.loads(raw)
+
+    def _is_stale(self, source: str, fetched: float, now: float) -> bool:
+        return now - fetched > self.ttls.get(source, DEFAULT_TTL)
+
+    # ── reads ────────────────────────────────────────────────────────────────
+    def get(self, source: str, app_id) -> tuple:
+        """
+        Returns (value, stale). Missing entries return (None, True).
+        Stale values are returned too, so the UI can paint them immediately.
+        """
+        try:
+            row = self._conn().execute(
+                "SELECT value, fetched FROM meta WHERE source=? AND app_id=?",
+                (source, str(app_id))).fetchone()
+        except sqlite3.Error:
+            return None, True
+        if row is None:
+            return None, True
+        return self._decode(row[0]), self._is_stale(source, row[1], time.time())
+
+    def get_many(self, source: str) -> dict[str, tuple]:
+        """All entries of a source: app_id -> (value, stale)."""
+        now = time.time()
+        try:
+            rows = self._conn().execute(
+                "SELECT app_id, value, fetched FROM meta WHERE source=?",
+                (source,)).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {aid: (self._decode(v), self._is_stale(source, f, now)) for aid, v, f in rows}
+
+    # ── writes ───────────────────────────────────────────────────────────────
+    def put(self, source: str, app_id, value):
+        self.put_many(source, {app_id: value})
+
+    def put_many(self, source: str, items: dict):
+        if not items:
+            return
+        now = time.time()
+        rows = [(source, str(aid), self._encode(v), now) for aid, v in items.items()]
+        try:
+            conn = self._conn()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta (source, app_id, value, fetched) "
+                    "VALUES (?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            print(f"⚠️ Metadata store write failed: {e}")
+
+    def delete(self, source: str, app_id):
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute("DELETE FROM meta WHERE source=? AND app_id=?",
+                             (source, str(app_id)))
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
@@ -0,0 +1,125 @@
+"""
+GameInSteam — Fetch scheduler
+One fixed pool of worker threads with priority classes, shared by every
+card on every page instead of one thread per card.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+PRIORITY_USER = 0       # user clicked / typed something
+PRIORITY_VISIBLE = 1    # card currently on screen
+PRIORITY_PREFETCH = 2   # off-screen card, fill in when idle
+
+DEFAULT_WORKERS = 6
+
+
+class FetchScheduler:
+    """
+    Priority work queue. submit() returns a concurrent.futures.Future, so
+    callers can use add_done_callback / result / cancel as usual.
+
+    Tasks can be tagged with a group (the page id). When the user leaves a
+    page, suspend_group() parks its pending tasks so they stop competing
+    with the page that is on screen; resume_group() queues them again.
+    cancel_group() drops them for good (e.g. the page is being rebuilt).
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        self._cond = threading.Condition()
+        self._queue: list = []                      # (priority, seq, group, fut, fn, args, kwargs)
+        self._parked: dict[str, list] = {}
+        self._suspended: set[str] = set()
+        self._seq = itertools.count()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"fetch-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    # ── public API ───────────────────────────────────────────────────────────
+    def submit(self, fn, *args, priority: int = PRIORITY_VISIBLE,
+               group: str | None = None, **kwargs) -> Future:
+        fut = Future()
+        item = (priority, next(self._seq), group, fut, fn, args, kwargs)
+        with self._cond:
+            if self._closed:
+                fut.cancel()
+                return fut
+            if group is not None and group in self._suspended:
+                self._parked.setdefault(group, []).append(item)
+            else:
+                heapq.heappush(self._queue, item)
+                self._cond.notify()
+        return fut
+
+    def suspend_group(self, group: str):
+        """Moves the group's pending tasks out of the queue until resume_group()."""
+        with self._cond:
+            self._suspended.add(group)
+            keep, parked = [], self._parked.setdefault(group, [])
+            for item in self._queue:
+                (parked if item[2] == group else keep).append(item)
+            heapq.heapify(keep)
+            self._queue = keep
+
+    def resume_group(self, group: str):
+        with self._cond:
+            self._suspended.discard(group)
+            for item in self._parked.pop(group, []):
+                heapq.heappush(self._queue, item)
+            self._cond.notify_all()
+
+    def cancel_group(self, group: str) -> int:
+        """Cancels every pending task of the group. Returns how many were dropped."""
+        with self._cond:
+            dropped = self._parked.pop(group, [])
+            keep = []
+            for item in self._queue:
+                (dropped if item[2] == group else keep).append(item)
+            heapq.heapify(keep)
+            self._queue = keep
+        for item in dropped:
+            item[3].cancel()
+        return len(dropped)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue) + sum(len(v) for v in self._parked.values())
+
+    def shutdown(self, timeout: float | None = 5.0):
+        """
+        Stops accepting work, cancels everything still queued and waits for the
+        tasks already running (disk / SQLite writes) to finish.
+        """
+        with self._cond:
+            self._closed = True
+            dropped = self._queue + [i for items in self._parked.values() for i in items]
+            self._queue, self._parked = [], {}
+            self._cond.notify_all()
+        for item in dropped:
+            item[3].cancel()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in self._threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    # ── worker ───────────────────────────────────────────────────────────────
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                _, _, _, fut, fn, args, kwargs = heapq.heappop(self._queue)
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                fut.set_exception(e)
@@ -0,0 +1,129 @@
+"""
+GameInSteam — Search index
+Pure-data filter index over AppID + game name, with precomputed category
+buckets. The UI asks it for the visible IDs and only touches the widgets
+whose visibility changed.
+"""
+
+from collections import OrderedDict
+
+MEMO_SIZE = 32   # recent (query, category) results kept for narrowing / backspace
+
+
+class SearchIndex:
+    """
+    Ordered set of AppIDs with a lowercased "appid\\nname" haystack per entry.
+
+    query() matches case-insensitively anywhere in the AppID or the name, so
+    prefixes are covered too. When the query extends an earlier one (typing),
+    only that earlier result is scanned instead of the whole index; going back
+    (backspace) hits the memo directly. Any name / category / membership
+    change bumps version and drops the memo.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._order: list[str] = []
+        self._rank: dict[str, int] = {}
+        self._names: dict[str, str] = {}            # survive reset(), e.g. on refresh
+        self._hay: dict[str, str] = {}
+        self._cats: dict[str, frozenset] = {}
+        self._buckets: dict[str, set[str]] = {}
+        self._bucket_lists: dict[str, list[str]] = {}
+        self._memo: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, app_id) -> bool:
+        return str(app_id) in self._rank
+
+    # ── updates ──────────────────────────────────────────────────────────────
+    def _changed(self):
+        self.version += 1
+        self._memo.clear()
+        self._bucket_lists.clear()
+
+    def reset(self, app_ids, names: dict | None = None):
+        """Replaces the entries (keeping their order). Known names / categories are kept."""
+        self._order = [str(a) for a in app_ids]
+        self._rank = {aid: i for i, aid in enumerate(self._order)}
+        if names:
+            for aid in self._order:
+                if names.get(aid):
+                    self._names[aid] = names[aid].lower()
+        self._hay = {aid: f"{aid}\n{self._names.get(aid, '')}" for aid in self._order}
+        for aid in [a for a in self._cats if a not in self._rank]:
+            self._set_cats(aid, ())
+        self._changed()
+
+    def set_name(self, app_id, name: str):
+        aid, low = str(app_id), (name or "").lower()
+        if self._names.get(aid) == low:
+            return
+        self._names[aid] = low
+        if aid in self._rank:
+            self._hay[aid] = f"{aid}\n{low}"
+            self._changed()
+
+    def _set_cats(self, aid: str, categories):
+        new = frozenset(categories)
+        old = self._cats.get(aid, frozenset())
+        if new == old:
+            return False
+        for c in old - new:
+            self._buckets[c].discard(aid)
+        for c in new - old:
+            self._buckets.setdefault(c, set()).add(aid)
+        if new:
+            self._cats[aid] = new
+        else:
+            self._cats.pop(aid, None)
+        return True
+
+    def set_categories(self, app_id, categories):
+        """Puts the entry in exactly these category buckets."""
+        if self._set_cats(str(app_id), categories):
+            self._changed()
+
+    def set_categories_many(self, items: dict):
+        """app_id -> categories, with a single version bump."""
+        changed = False
+        for aid, cats in items.items():
+            changed |= self._set_cats(str(aid), cats)
+        if changed:
+            self._changed()
+
+    # ── queries ──────────────────────────────────────────────────────────────
+    def _bucket(self, category: str | None) -> list[str]:
+        if category is None:
+            return self._order
+        lst = self._bucket_lists.get(category)
+        if lst is None:
+            members = [a for a in self._buckets.get(category, ()) if a in self._rank]
+            lst = sorted(members, key=self._rank.__getitem__)
+            self._bucket_lists[category] = lst
+        return lst
+
+    def query(self, text: str = "", category: str | None = None) -> list[str]:
+        """AppIDs matching text (and in category, if given), in index order."""
+        q = text.strip().lower()
+        key = (q, category)
+        hit = self._memo.get(key)
+        if hit is not None:
+            self._memo.move_to_end(key)
+            return hit
+
+        candidates = self._bucket(category)
+        for n in range(len(q) - 1, 0, -1):   # longest memoized shorter query
+            prev = self._memo.get((q[:n], category))
+            if prev is not None:
+                candidates = prev
+                break
+        hay = self._hay
+        result = [aid for aid in candidates if q in hay[aid]] if q else list(candidates)
+
+        self._memo[key] = result
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return result
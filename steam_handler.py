@@ -1,12 +1,21 @@
+import io
 import os
+import re
+import json
+import hashlib
 import sys
-import glob
+import heapq
 import time
 import zipfile
 import shutil
 import subprocess
 import tempfile
-import requests
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+import http_client
 
 # --- AYARLAR ---
 _DEFAULT_STEAM = r"C:\Program Files (x86)\Steam"
@@ -14,7 +23,7 @@ MIN_XINPUT_DLL_SIZE = 200_000
 XINPUT_DLL_NAME = "xinput1_4.dll"
 
 
-def get_steam_path() -> str:
+def _resolve_steam_path() -> str:
     """Steam kurulum dizinini registry'den okur, yoksa varsayilan yolu kullanir."""
     try:
         import winreg
@@ -37,8 +46,125 @@ def get_steam_path() -> str:
     return _DEFAULT_STEAM
 
 
+_VDF_PATH_RE = re.compile(r'^\s*"path"\s+"([^"]+)"\s*$', re.MULTILINE)
+_VDF_LEGACY_RE = re.compile(r'^\s*"\d+"\s+"([^"]+)"\s*$', re.MULTILINE)
+
+
+def _parse_library_folders(install_path: str) -> list[str]:
+    """
+    steamapps/libraryfolders.vdf dosyasindaki tum kutuphane klasorlerini dondurur.
+    Hem yeni ("path" anahtari) hem eski ("1" "D:\\Lib") formati desteklenir.
+    Kurulum dizini her zaman ilk siradadir.
+    """
+    folders = [install_path]
+    vdf = os.path.join(install_path, "steamapps", "libraryfolders.vdf")
+    try:
+        with open(vdf, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return folders
+
+    seen = {os.path.normcase(os.path.normpath(install_path))}
+    for raw in _VDF_PATH_RE.findall(text) or _VDF_LEGACY_RE.findall(text):
+        path = raw.replace("\\\\", "\\")
+        key = os.path.normcase(os.path.normpath(path))
+        if key not in seen and os.path.isdir(path):
+            seen.add(key)
+            folders.append(path)
+    return folders
+
+
+class SteamEnvironment:
+    """
+    Steam kurulumuna ait yollar. Bir kez cozulur ve invalidate_steam_env()
+    cagrilana kadar onbellekte kalir; registry / vdf her oyun icin tekrar okunmaz.
+    """
+
+    def __init__(self, install_path: str):
+        self.install_path = install_path
+        self.stplugin_dir = os.path.join(install_path, "config", "stplug-in")
+        self.steam_exe = os.path.join(install_path, "steam.exe")
+        self.appcache_dir = os.path.join(install_path, "appcache")
+        self.library_folders = _parse_library_folders(install_path)
+
+    @property
+    def steamapps_dirs(self) -> list[str]:
+        return [os.path.join(lib, "steamapps") for lib in self.library_folders]
+
+    def acf_paths(self, app_id) -> list[str]:
+        """AppID'ye ait, tum kutuphanelerde var olan appmanifest dosyalari."""
+        name = f"appmanifest_{app_id}.acf"
+        return [p for p in (os.path.join(d, name) for d in self.steamapps_dirs)
+                if os.path.isfile(p)]
+
+    def __repr__(self):
+        return (f"SteamEnvironment(install_path={self.install_path!r}, "
+                f"libraries={len(self.library_folders)})")
+
+
+_steam_env: SteamEnvironment | None = None
+_steam_env_lock = threading.Lock()
+
+
+def get_steam_env() -> SteamEnvironment:
+    """Onbellekteki Steam ortamini dondurur; ilk cagrida cozer."""
+    global _steam_env
+    env = _steam_env
+    if env is None:
+        with _steam_env_lock:
+            if _steam_env is None:
+                _steam_env = SteamEnvironment(_resolve_steam_path())
+            env = _steam_env
+    return env
+
+
+def invalidate_steam_env():
+    """Steam yeniden kuruldu / tasindi / kutuphane eklendi: bir sonraki cagrida yeniden coz."""
+    global _steam_env
+    with _steam_env_lock:
+        _steam_env = None
+
+
+def get_steam_path() -> str:
+    return get_steam_env().install_path
+
+
 def get_stplugin_dir() -> str:
-    return os.path.join(get_steam_path(), "config", "stplug-in")
+    return get_steam_env().stplugin_dir
+
+
+def get_app_data_dir() -> str:
+    """Kalıcı önbellekler için uygulama veri dizini (%LOCALAPPDATA%\\GameInSteam)."""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "GameInSteam")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _read_json(path: str, default=None):
+    """JSON dosyasını okur; dosya yoksa veya bozuksa default döner."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+
+def _atomic_write_json(path: str, obj):
+    """JSON'u path.tmp'ye yazıp os.replace ile taşır; yarım yazılmış dosya kalmaz. Hata fırlatır."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
+
+
+def _dir_signature(path: str):
+    """Dizinin imzası (mtime_ns, inode); dosya eklenince / silinince değişir. Yoksa None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_ino]
 
 
 def _bundled_xinput_path() -> str:
@@ -84,7 +210,15 @@ def install_stplugin_dll(force: bool = False) -> tuple[bool, str]:
         return False, f"Failed to install {XINPUT_DLL_NAME}: {e}"
 
 STEAM_API_URL = "https://store.steampowered.com/api/appdetails"
-GAMELIST_BASE_URL = "https://raw.githubusercontent.com/kakies13/gamelist/main"
+STORE_SEARCH_URL = "https://store.steampowered.com/api/storesearch/"
+GAMELIST_REPO = "kakies13/gamelist"
+GAMELIST_BRANCH = "main"
+GAMELIST_BASE_URL = f"https://raw.githubusercontent.com/{GAMELIST_REPO}/{GAMELIST_BRANCH}"
+GAMELIST_TREE_URL = f"https://api.github.com/repos/{GAMELIST_REPO}/git/trees/{GAMELIST_BRANCH}"
+GAMELIST_MANIFEST_URL = f"{GAMELIST_BASE_URL}/manifest.json"
+MANIFEST_PROBE_INTERVAL = 86400  # repo manifest.json yayınlamıyorsa günde bir kez yeniden denenir
+MANIFEST_FRESH_FOR = 3600        # bu süreden yeni liste, ağa gitmeden "repoda var" cevabı verebilir
+ZIP_SPOOL_MAX = 8 * 1024 * 1024  # bundan büyük zip'ler bellekten geçici dosyaya taşar
 
 
 # =============================================================================
@@ -115,109 +249,717 @@ def setup_dirs():
 # =============================================================================
 # 2. MODÜL: ÖNBELLEK TEMİZLEYİCİ
 # =============================================================================
-def clear_steam_cache():
-    """Steam'in eski lisans verilerini zorla yenilemesi için cache temizler."""
-    cache_path = os.path.join(get_steam_path(), "appcache")
-    if os.path.exists(cache_path):
+# Lisans / uygulama bilgisi önbellekleri: stplug-in değişince yenilenmesi gerekenler.
+# librarycache (kapak görselleri), httpcache, stats vb. dokunulmadan kalır.
+APPCACHE_LICENSE_FILES = ("appinfo.vdf", "packageinfo.vdf")
+
+
+def _appcache_state_path() -> str:
+    return os.path.join(get_app_data_dir(), "appcache_state.json")
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def clear_steam_cache(full: bool = False):
+    """
+    Steam'in eski lisans verilerini zorla yenilemesi için appcache'i geçersiz kılar.
+
+    Varsayılan: sadece APPCACHE_LICENSE_FILES silinir, o da stplug-in son
+    temizlikten beri değiştiyse. full=True: tüm appcache dizini silinir (eski davranış).
+    Bir dosya silinemezse (ör. Steam hâlâ açık) imza kaydedilmez; sonraki
+    çağrı temizliği tekrar dener.
+
+    Returns: {"mode": "full" | "targeted" | "skipped", "removed": [...],
+              "failed": [...], "bytes": int, "seconds": float}
+    """
+    started = time.monotonic()
+    cache_path = get_steam_env().appcache_dir
+    report = {"mode": "full" if full else "targeted", "removed": [], "failed": [], "bytes": 0}
+    signature = _dir_signature(get_stplugin_dir())
+
+    if full:
+        if os.path.exists(cache_path):
+            try:
+                report["bytes"] = _dir_size(cache_path)
+                shutil.rmtree(cache_path)
+                report["removed"].append(cache_path)
+            except Exception as e:
+                report["failed"].append(cache_path)
+                print(f"⚠️ Could not clear cache: {e}")
+    else:
+        state = _read_json(_appcache_state_path())
+        last = state.get("stplugin_signature") if isinstance(state, dict) else None
+        if signature is not None and signature == last:
+            report["mode"] = "skipped"   # stplug-in değişmedi, lisans önbelleği güncel
+        else:
+            for name in APPCACHE_LICENSE_FILES:
+                path = os.path.join(cache_path, name)
+                try:
+                    size = os.path.getsize(path)
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    report["failed"].append(name)
+                    print(f"⚠️ Could not remove {name}: {e}")
+                    continue
+                report["removed"].append(name)
+                report["bytes"] += size
+
+    if report["mode"] != "skipped" and not report["failed"]:
         try:
-            shutil.rmtree(cache_path)
-            print("🧹 Steam cache (appcache) cleared.")
-        except Exception as e:
-            print(f"⚠️ Could not clear cache: {e}")
+            _atomic_write_json(_appcache_state_path(), {"stplugin_signature": signature})
+        except Exception:
+            pass
+
+    report["seconds"] = time.monotonic() - started
+    if report["mode"] == "skipped":
+        print("🧹 Steam cache: stplug-in unchanged, nothing to invalidate.")
+    else:
+        print(f"🧹 Steam cache ({report['mode']}): removed "
+              f"{', '.join(os.path.basename(p) for p in report['removed']) or 'nothing'} "
+              f"({report['bytes'] / 1048576:.1f} MB) in {report['seconds']:.2f}s")
+    return report
 
 
 # =============================================================================
 # 3. MODÜL: GAMELİST REPO İNDİRİCİ
 # =============================================================================
+def _spool_zip(resp):
+    """
+    Yanıt gövdesini belleğe (büyükse geçici dosyaya) akıtır, SHA-256'sını hesaplar.
+
+    Returns: (buffer, sha256_hex) veya (None, None) — geçerli bir ZIP değilse
+    """
+    buf = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX)
+    digest = hashlib.sha256()
+    try:
+        for chunk in resp.iter_content(chunk_size=65536):
+            buf.write(chunk)
+            digest.update(chunk)
+        buf.seek(0)
+        if buf.read(2) != b"PK":
+            print(f"  ❌ Response is not a valid ZIP file.")
+            buf.close()
+            return None, None
+        buf.seek(0)
+        return buf, digest.hexdigest()
+    except Exception:
+        buf.close()
+        raise
+
+
+def install_lua_from_zip(app_id, zip_data):
+    """
+    İndirilmiş zip içindeki lua dosyasını stplug-in dizinine yerleştirir (disk kısmı).
+    Lua önce stplug-in içinde geçici bir dosyaya yazılır, sonra os.replace ile
+    atomik olarak {app_id}.lua adına taşınır — yarım yazılmış lua kalmaz.
+
+    zip_data: bytes veya file-like (fetch_gamelist_zip_cached çıktısı); işlem sonunda kapatılır.
+    Returns: lua_path veya None
+    """
+    setup_dirs()
+    stplugin_dir = get_stplugin_dir()
+    lua_dest = os.path.join(stplugin_dir, f"{app_id}.lua")
+    if isinstance(zip_data, (bytes, bytearray)):
+        zip_data = io.BytesIO(zip_data)
+
+    tmp_path = None
+    try:
+        with zip_data, zipfile.ZipFile(zip_data, "r") as z:
+            member = next(
+                (n for n in z.namelist()
+                 if n.lower().endswith(".lua") and "readme" not in n.lower()),
+                None,
+            )
+            if member is None:
+                print(f"  ❌ No lua file found inside zip.")
+                return None
+
+            with z.open(member) as src, tempfile.NamedTemporaryFile(
+                    dir=stplugin_dir, prefix=f".{app_id}.", suffix=".tmp",
+                    delete=False) as dst:
+                tmp_path = dst.name
+                shutil.copyfileobj(src, dst)
+                if dst.tell() == 0:
+                    print(f"  ❌ Lua file inside zip is empty.")
+                    return None
+
+        os.replace(tmp_path, lua_dest)
+        tmp_path = None
+        print(f"  ✅ Lua extracted → stplug-in/{app_id}.lua")
+        return lua_dest
+
+    except Exception as e:
+        print(f"  ⚠️ Gamelist error: {type(e).__name__}: {e}")
+        return None
+    finally:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+
+
 def download_from_gamelist(app_id):
     """
     kakies13/gamelist reposundan AppID'ye ait zip dosyasını indirir,
     içindeki lua dosyasını doğrudan stplug-in dizinine yerleştirir.
 
+    Zip önbellek üzerinden alınır; böylece ilk güncelleme koşullu GET yapabilir.
+
     Returns: lua_path veya None
     """
-    setup_dirs()
+    zip_buf, _, fetched = fetch_gamelist_zip_cached(app_id)
+    if zip_buf is None:
+        return None
+    return install_cached_zip(app_id, zip_buf, fetched)
+
+
+# =============================================================================
+# 3b. MODÜL: ZIP ÖNBELLEĞİ (ETag / If-None-Match)
+# =============================================================================
+# Zip'ler SHA-256 adıyla saklanır (content-addressed); index.json her AppID için
+# hangi blob'un geçerli olduğunu ve sunucunun ETag / Last-Modified değerlerini tutar.
+_zip_index: dict | None = None
+_zip_index_lock = threading.Lock()
+
+
+def _zip_cache_dir() -> str:
+    path = os.path.join(get_app_data_dir(), "zip_cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _zip_index_path() -> str:
+    return os.path.join(_zip_cache_dir(), "index.json")
+
+
+def _load_zip_index() -> dict:
+    global _zip_index
+    if _zip_index is None:
+        _zip_index = _read_json(_zip_index_path(), {})
+    return _zip_index
+
+
+def _save_zip_index():
+    try:
+        _atomic_write_json(_zip_index_path(), _zip_index)
+    except Exception as e:
+        print(f"  ⚠️ Zip cache index could not be saved: {e}")
+
+
+def _open_cached_zip(app_id):
+    """Önbellekteki zip'i hash doğrulamasıyla açar. Returns: BytesIO veya None"""
+    with _zip_index_lock:
+        entry = _load_zip_index().get(str(app_id))
+    if not entry:
+        return None
+    try:
+        with open(os.path.join(_zip_cache_dir(), f"{entry['sha256']}.zip"), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        return None
+    return io.BytesIO(data)
+
+
+def _git_blob_sha(buf) -> str:
+    """Git'in blob SHA-1'i (trees API'deki "sha" alanı) — manifest ile karşılaştırmak için."""
+    size = buf.seek(0, 2)
+    buf.seek(0)
+    digest = hashlib.sha1(b"blob %d\0" % size)
+    for chunk in iter(lambda: buf.read(65536), b""):
+        digest.update(chunk)
+    buf.seek(0)
+    return digest.hexdigest()
+
+
+def _write_zip_blob(buf, sha256) -> str:
+    """Zip'i content-addressed blob olarak yazar. Returns: git blob SHA'sı"""
+    blob = os.path.join(_zip_cache_dir(), f"{sha256}.zip")
+    git_sha = _git_blob_sha(buf)
+    if not os.path.isfile(blob):
+        tmp = blob + ".tmp"
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(buf, f)
+        os.replace(tmp, blob)
+    buf.seek(0)
+    return git_sha
+
+
+def _drop_unreferenced_blob(index: dict, sha256):
+    """Hiçbir AppID'nin kullanmadığı blob'u siler (_zip_index_lock altında çağrılır)."""
+    if sha256 and not any(e.get("sha256") == sha256 for e in index.values()):
+        try:
+            os.remove(os.path.join(_zip_cache_dir(), f"{sha256}.zip"))
+        except OSError:
+            pass
+
+
+def install_cached_zip(app_id, zip_buf, fetched):
+    """
+    install_lua_from_zip + önbellek kaydı. Index (ETag / SHA) sadece kurulum
+    başarılı olursa güncellenir; aksi halde bir sonraki güncelleme 304 veya
+    aynı SHA yüzünden "güncel" sanıp eski lua'yı yerinde bırakırdı.
+
+    fetched: fetch_gamelist_zip_cached'in üçüncü değeri (304 ise None)
+    Returns: lua_path veya None
+    """
+    app_id = str(app_id)
+    lua_path = install_lua_from_zip(app_id, zip_buf)
+    if fetched is None:
+        return lua_path
+    with _zip_index_lock:
+        index = _load_zip_index()
+        if lua_path:
+            old = index.get(app_id, {}).get("sha256")
+            index[app_id] = dict(fetched, checked=time.time())
+            if old != fetched["sha256"]:
+                _drop_unreferenced_blob(index, old)
+            _save_zip_index()
+        else:
+            _drop_unreferenced_blob(index, fetched["sha256"])
+    return lua_path
+
+
+def _discard_cached_zip(fetched):
+    """Kurulmayacak, yeni indirilmiş zip'in blob'unu siler (fetched None ise no-op)."""
+    if fetched is None:
+        return
+    with _zip_index_lock:
+        _drop_unreferenced_blob(_load_zip_index(), fetched["sha256"])
+
+
+def fetch_gamelist_zip_cached(app_id):
+    """
+    Zip'i önbellek üzerinden, koşullu GET ile alır.
+    Sunucu 304 dönerse gövde aktarılmaz; önbellekteki kopya kullanılır.
+
+    Önbellek index'i burada değil, kurulum başarılı olunca install_cached_zip
+    içinde güncellenir.
+
+    Returns: (zip_buffer | None, changed: bool, fetched: dict | None)
+      changed=False → upstream değişmemiş ya da kurulu sürümle aynı
+      fetched       → yeni indirilen zip'in kaydı (304 / hata ise None)
+    """
+    app_id = str(app_id)
     zip_url = f"{GAMELIST_BASE_URL}/{app_id}.zip"
-    lua_dest = os.path.join(get_stplugin_dir(), f"{app_id}.lua")
 
-    print(f"  📥 Downloading AppID {app_id} from gamelist repo...")
+    with _zip_index_lock:
+        entry = dict(_load_zip_index().get(app_id) or {})
+    headers = {}
+    if entry and os.path.isfile(os.path.join(_zip_cache_dir(), f"{entry['sha256']}.zip")):
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    print(f"  📥 Checking AppID {app_id} in gamelist repo...")
+    try:
+        with http_client.get(zip_url, timeout=15, stream=True, headers=headers) as resp:
+            if resp.status_code == 304:
+                cached = _open_cached_zip(app_id)
+                if cached is not None:
+                    print(f"  ✅ AppID {app_id} unchanged upstream (HTTP 304).")
+                    return cached, False, None
+                # Önbellek bozuk: kaydı düşür, koşulsuz olarak yeniden indir
+                with _zip_index_lock:
+                    _load_zip_index().pop(app_id, None)
+                    _save_zip_index()
+                return fetch_gamelist_zip_cached(app_id)
+
+            if resp.status_code != 200:
+                print(f"  ❌ AppID {app_id} not found in gamelist repo (HTTP {resp.status_code}).")
+                return None, False, None
+
+            buf, sha256 = _spool_zip(resp)
+            if buf is None:
+                return None, False, None
+            fetched = {"sha256": sha256, "etag": resp.headers.get("ETag"),
+                       "last_modified": resp.headers.get("Last-Modified")}
+
+        if sha256 == entry.get("sha256"):
+            # Kurulu sürümle aynı içerik: sadece yeni ETag'i kaydet
+            with _zip_index_lock:
+                index = _load_zip_index()
+                if app_id in index:
+                    index[app_id].update(etag=fetched["etag"],
+                                         last_modified=fetched["last_modified"],
+                                         checked=time.time())
+                    _save_zip_index()
+            return buf, False, None
+
+        try:
+            fetched["git_sha"] = _write_zip_blob(buf, sha256)
+        except Exception as e:
+            buf.seek(0)
+            fetched = None
+            print(f"  ⚠️ Zip cache write failed: {e}")
+        return buf, True, fetched
+
+    except Exception as e:
+        print(f"  ⚠️ Gamelist error: {type(e).__name__}: {e}")
+        return None, False, None
+
+
+def cached_zip_git_sha(app_id):
+    """Önbellekteki zip'in git blob SHA'sı (yoksa None)."""
+    with _zip_index_lock:
+        return (_load_zip_index().get(str(app_id)) or {}).get("git_sha")
+
+
+# =============================================================================
+# 3c. MODÜL: GAMELİST MANİFESTİ (git trees API / manifest.json)
+# =============================================================================
+# Repo listesi diske kaydedilir; Available Games açılışta bunu anında çizer,
+# ağdan gelen tazeleme ETag ile koşullu yapılır (304 → gövde yok, rate-limit yok).
+# Her kayıt boyut + SHA taşır, böylece bir tazeleme sadece değişenleri bildirir.
+#
+#   {"source": "tree" | "manifest", "etag": ..., "synced": ts,
+#    "manifest_missing": ts, "entries": {app_id: {"size": n, "sha": "..."}}}
+_manifest: dict | None = None
+_manifest_lock = threading.Lock()
+
+
+def _manifest_path() -> str:
+    return os.path.join(get_app_data_dir(), "gamelist_manifest.json")
+
+
+def _load_manifest() -> dict:
+    global _manifest
+    if _manifest is None:
+        _manifest = _read_json(_manifest_path(), {})
+    return _manifest
+
 
+def _save_manifest():
     try:
-        resp = requests.get(zip_url, timeout=15)
+        _atomic_write_json(_manifest_path(), _manifest)
+    except Exception as e:
+        print(f"  ⚠️ Gamelist manifest could not be saved: {e}")
+
+
+def _parse_tree(data) -> dict:
+    """git trees API yanıtı → {app_id: {"size", "sha"}} (kök dizindeki <appid>.zip blob'ları)."""
+    if data.get("truncated"):
+        print("  ⚠️ Gamelist tree listing was truncated by GitHub.")
+    entries = {}
+    for item in data.get("tree", []):
+        path = item.get("path", "")
+        if item.get("type") == "blob" and path.endswith(".zip") and path[:-4].isdigit():
+            entries[path[:-4]] = {"size": item.get("size"), "sha": item.get("sha")}
+    return entries
+
+
+def _parse_published_manifest(data) -> dict:
+    """
+    Repodaki manifest.json → {app_id: {"size", "sha"}}.
+    Kabul edilen biçimler: {"games": {...}}, {app_id: {...}}, [{"app_id", "size", "sha"}], [app_id, ...]
+    """
+    if isinstance(data, dict) and "games" in data:
+        data = data["games"]
+    if isinstance(data, dict):
+        items = ((k, v) for k, v in data.items())
+    else:
+        items = ((v.get("app_id"), v) if isinstance(v, dict) else (v, {}) for v in data)
+    entries = {}
+    for app_id, meta in items:
+        app_id = str(app_id or "")
+        if app_id.isdigit():
+            meta = meta if isinstance(meta, dict) else {}
+            entries[app_id] = {"size": meta.get("size"), "sha": meta.get("sha")}
+    return entries
+
+
+def _fetch_listing(state: dict):
+    """
+    Yayınlanmış manifest.json'u, yoksa git trees API'yi koşullu GET ile sorar.
+
+    Returns: (entries | None, source, etag, manifest_missing)
+      entries None → ağ hatası; 304'te önceki kayıtlar döner.
+    """
+    old = state.get("entries") or {}
+    missing = state.get("manifest_missing", 0)
+
+    if time.time() - missing > MANIFEST_PROBE_INTERVAL:
+        headers = {}
+        if state.get("source") == "manifest" and state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        with http_client.get(GAMELIST_MANIFEST_URL, timeout=15, headers=headers) as resp:
+            if resp.status_code == 304:
+                return old, "manifest", state.get("etag"), 0
+            if resp.status_code == 200:
+                return (_parse_published_manifest(resp.json()), "manifest",
+                        resp.headers.get("ETag"), 0)
+            if resp.status_code == 404:
+                missing = time.time()
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if state.get("source") == "tree" and state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    with http_client.get(GAMELIST_TREE_URL, timeout=15, headers=headers) as resp:
+        if resp.status_code == 304:
+            return old, "tree", state.get("etag"), missing
         if resp.status_code != 200:
-            print(f"  ❌ AppID {app_id} not found in gamelist repo (HTTP {resp.status_code}).")
-            return None
+            print(f"⚠️ Gamelist API error: HTTP {resp.status_code}")
+            return None, "tree", None, missing
+        return _parse_tree(resp.json()), "tree", resp.headers.get("ETag"), missing
 
-        zip_bytes = resp.content
 
-        if zip_bytes[:2] != b"PK":
-            print(f"  ❌ Response is not a valid ZIP file.")
-            return None
+def get_cached_gamelist_games():
+    """Diskteki son listeyi döner (ağ yok). Returns: sıralı app_id listesi"""
+    with _manifest_lock:
+        entries = _load_manifest().get("entries") or {}
+        return sorted(entries, key=int)
 
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
-            tmp.write(zip_bytes)
-            tmp_path = tmp.name
 
-        try:
-            with zipfile.ZipFile(tmp_path, "r") as z:
-                lua_found = False
-                for name in z.namelist():
-                    if name.lower().endswith(".lua") and "readme" not in name.lower():
-                        lua_data = z.read(name)
-                        with open(lua_dest, "wb") as f:
-                            f.write(lua_data)
-                        lua_found = True
-                        print(f"  ✅ Lua extracted → stplug-in/{app_id}.lua")
-                        break
-
-                if not lua_found:
-                    print(f"  ❌ No lua file found inside zip.")
-                    return None
-        finally:
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
+def gamelist_manifest_fresh(max_age: float = MANIFEST_FRESH_FOR) -> bool:
+    """Diskteki liste max_age'den yeni mi (eksik AppID'ler için "yok" cevabı güvenilir mi)."""
+    with _manifest_lock:
+        return time.time() - _load_manifest().get("synced", 0) <= max_age
+
+
+def gamelist_entry(app_id, max_age: float = MANIFEST_FRESH_FOR):
+    """
+    Liste max_age'den yeniyse AppID'nin {"size", "sha"} kaydı, değilse / yoksa None.
+    """
+    with _manifest_lock:
+        state = _load_manifest()
+        if time.time() - state.get("synced", 0) > max_age:
+            return None
+        return (state.get("entries") or {}).get(str(app_id))
 
-        return lua_dest
 
+def sync_gamelist_manifest():
+    """
+    Repo listesini tazeler ve diske kaydeder.
+
+    Returns: {"added": [...], "removed": [...], "modified": [...]} veya None (ağ hatası)
+    """
+    with _manifest_lock:
+        state = dict(_load_manifest())
+    try:
+        entries, source, etag, missing = _fetch_listing(state)
     except Exception as e:
-        print(f"  ⚠️ Gamelist error: {type(e).__name__}: {e}")
+        print(f"⚠️ Gamelist repo fetch error: {type(e).__name__}: {e}")
         return None
+    if entries is None:
+        return None
+
+    old = state.get("entries") or {}
+    diff = {
+        "added":    [a for a in entries if a not in old],
+        "removed":  [a for a in old if a not in entries],
+        "modified": [a for a in entries if a in old and old[a] != entries[a]],
+    }
+    global _manifest
+    with _manifest_lock:
+        _manifest = {"source": source, "etag": etag, "synced": time.time(),
+                     "manifest_missing": missing, "entries": entries}
+        _save_manifest()
+    return diff
 
 
 # =============================================================================
 # 4. MODÜL: STEAM YENİDEN BAŞLATMA
 # =============================================================================
-def restart_steam():
-    """Steam'i kapatıp yeniden başlatır."""
-    steam_exe = os.path.join(get_steam_path(), "steam.exe")
+STEAM_EXIT_TIMEOUT = 15.0    # taskkill sonrası sürecin kapanması için üst sınır
+STEAM_READY_TIMEOUT = 60.0   # yeniden başlatılan Steam'in hazır olması için üst sınır
+STEAM_POLL_INTERVAL = 0.25
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)  # --windowed exe'de konsol açılmasın
+
+
+def is_steam_running() -> bool | None:
+    """
+    steam.exe süreci çalışıyor mu (tasklist).
+    Returns: True / False, tasklist çalışmaz ya da zaman aşımına uğrarsa None (bilinmiyor).
+    """
+    try:
+        proc = subprocess.run(
+            ["tasklist", "/FI", "IMAGENAME eq steam.exe", "/NH"],
+            capture_output=True, text=True, timeout=5, creationflags=_NO_WINDOW,
+        )
+    except Exception:
+        return None
+    if proc.returncode != 0:
+        return None
+    return "steam.exe" in proc.stdout.lower()
+
 
+def _steam_active_process():
+    """HKCU'deki Steam ActiveProcess anahtarı → (pid, ActiveUser); okunamazsa (None, None)."""
+    try:
+        import winreg
+
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER,
+                            r"Software\Valve\Steam\ActiveProcess") as key:
+            pid = winreg.QueryValueEx(key, "pid")[0]
+            try:
+                user = winreg.QueryValueEx(key, "ActiveUser")[0]
+            except OSError:
+                user = 0
+            return pid, user
+    except Exception:
+        return None, None
+
+
+def _wait_until(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(STEAM_POLL_INTERVAL)
+
+
+def restart_steam(on_phase=None, full_cache_wipe: bool = False):
+    """
+    Steam'i kapatıp yeniden başlatır; sabit beklemeler yerine gerçek sinyalleri bekler.
+
+      shutdown → steam.exe süreci bitene kadar (en fazla STEAM_EXIT_TIMEOUT)
+      cache    → appcache geçersiz kılma (sadece Steam gerçekten kapandıysa;
+                 full_cache_wipe=True ise tüm appcache silinir)
+      launch   → steam.exe başlatılır
+      ready    → registry'deki ActiveProcess yeni bir pid (ve giriş yapılmışsa
+                 ActiveUser) gösterene kadar (en fazla STEAM_READY_TIMEOUT)
+
+    on_phase(phase, seconds, ok) her aşama bitince çağrılır.
+    Returns: True (Steam başlatıldı) / False (steam.exe bulunamadı)
+    """
+    steam_exe = get_steam_env().steam_exe
+    if not os.path.isfile(steam_exe):
+        print("❌ Steam.exe not found!")
+        return False
+
+    def _phase(name, started, ok):
+        took = time.monotonic() - started
+        print(f"  ⏱️ {name}: {took:.1f}s{'' if ok else ' (timed out)'}")
+        if on_phase:
+            on_phase(name, took, ok)
+
+    old_pid, old_user = _steam_active_process()
+    total = time.monotonic()
     print("\n🔄 Restarting Steam...")
+
+    t = time.monotonic()
     subprocess.run(
         ["taskkill", "/F", "/IM", "steam.exe"],
         check=False,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
+        creationflags=_NO_WINDOW,
     )
-    time.sleep(4)
+    # Bilinmeyen durum "hâlâ açık" sayılır: kilitli appcache'e dokunulmaz
+    exited = _wait_until(lambda: is_steam_running() is False, STEAM_EXIT_TIMEOUT)
+    _phase("shutdown", t, exited)
 
-    clear_steam_cache()
+    t = time.monotonic()
+    if exited:
+        clear_steam_cache(full=full_cache_wipe)
+    else:
+        print("⚠️ Steam is still running; cache left untouched.")
+    _phase("cache", t, exited)
 
-    if os.path.isfile(steam_exe):
-        print("🚀 Starting Steam...")
-        subprocess.Popen([steam_exe])
-        time.sleep(10)
-        print("✅ Steam started.")
-        return True
+    t = time.monotonic()
+    print("🚀 Starting Steam...")
+    subprocess.Popen([steam_exe])
+    _phase("launch", t, True)
+
+    t = time.monotonic()
+    if old_pid is None:   # registry okunamıyor: süreç görünene kadar bekle
+        ready = _wait_until(lambda: is_steam_running() is True, STEAM_READY_TIMEOUT)
     else:
-        print("❌ Steam.exe not found!")
-        return False
+        def _ready():
+            pid, user = _steam_active_process()
+            return bool(pid) and pid != old_pid and (bool(user) or not old_user)
+        ready = _wait_until(_ready, STEAM_READY_TIMEOUT)
+    _phase("ready", t, ready)
+
+    print(f"✅ Steam started in {time.monotonic() - total:.1f}s.")
+    return True
 
 
 # =============================================================================
 # 5. MODÜL: ANA AKIŞ
 # =============================================================================
+_app_locks: dict[str, threading.Lock] = {}
+_app_locks_guard = threading.Lock()
+
+BATCH_MAX_WORKERS = 4
+
+
+@contextmanager
+def app_lock(app_id):
+    """Aynı AppID üzerinde add / update / remove işlemlerinin çakışmasını engeller."""
+    app_id = str(app_id)
+    with _app_locks_guard:
+        lock = _app_locks.setdefault(app_id, threading.Lock())
+    with lock:
+        yield
+
+
+def _prepare_system():
+    """DLL kurulumu + sistem kontrolü. Batch başına bir kez çağrılır."""
+    install_stplugin_dll()
+    system_ok, system_msg = check_stplugin_system()
+    if not system_ok:
+        print(f"⚠️ {system_msg}")
+    else:
+        print(f"✅ {system_msg}")
+    return system_ok
+
+
+def _remove_old_acf(app_id):
+    for old_acf in get_steam_env().acf_paths(app_id):
+        try:
+            os.remove(old_acf)
+            print(f"🧹 Old ACF manifest deleted.")
+        except Exception:
+            pass
+
+
+def _not_found_message(app_id):
+    return (
+        f"{app_id}: Lua file could not be downloaded!\n\n"
+        "This AppID was not found in the gamelist repo.\n\n"
+        "Possible reasons:\n"
+        "• This game hasn't been added to the gamelist repo yet\n"
+        "• No internet connection\n"
+        "• Invalid App ID\n\n"
+        "Solution:\n"
+        "1. Check your internet connection\n"
+        "2. Verify the App ID is correct\n"
+        "3. Request this game to be added to the gamelist repo"
+    )
+
+
+def _added_message(app_id, app_name, system_ok):
+    if system_ok:
+        return (
+            f"'{app_name}' (AppID: {app_id}) successfully added!\n"
+            f"Source: Gamelist Repo\n"
+            f"Lua: stplug-in/{app_id}.lua ✅\n\n"
+            f"Please restart Steam to see it in your library."
+        )
+    return (
+        f"Files placed but {XINPUT_DLL_NAME} is missing!\n\n"
+        f"Reinstall GameInSteam setup or restart the app as Administrator.\n"
+        f"Then restart Steam."
+    )
+
+
 def add_shortcut_from_manifest(app_id, app_name, on_progress=None, auto_restart=False):
     """
     Oyunu Steam kütüphanesine ekler.
@@ -234,39 +976,22 @@ def add_shortcut_from_manifest(app_id, app_name, on_progress=None, auto_restart=
             on_progress(pct, msg)
 
     _prog(0.05, "Checking system...")
-    install_stplugin_dll()
-    system_ok, system_msg = check_stplugin_system()
-    if not system_ok:
-        print(f"⚠️ {system_msg}")
-    else:
-        print(f"✅ {system_msg}")
+    system_ok = _prepare_system()
 
     _prog(0.20, f"Downloading AppID {app_id} from gamelist repo...")
-    lua_path = download_from_gamelist(app_id)
+    zip_buf, _, fetched = fetch_gamelist_zip_cached(app_id)
+    if zip_buf is None:
+        return False, _not_found_message(app_id)
 
-    if not lua_path:
-        return False, (
-            f"{app_id}: Lua file could not be downloaded!\n\n"
-            "This AppID was not found in the gamelist repo.\n\n"
-            "Possible reasons:\n"
-            "• This game hasn't been added to the gamelist repo yet\n"
-            "• No internet connection\n"
-            "• Invalid App ID\n\n"
-            "Solution:\n"
-            "1. Check your internet connection\n"
-            "2. Verify the App ID is correct\n"
-            "3. Request this game to be added to the gamelist repo"
-        )
+    # Kilit sadece yazma adımında tutulur (indirme remove_game'i bekletmez)
+    with app_lock(app_id):
+        lua_path = install_cached_zip(app_id, zip_buf, fetched)
 
-    _prog(0.70, "Cleaning up...")
+        if not lua_path:
+            return False, _not_found_message(app_id)
 
-    old_acf = os.path.join(get_steam_path(), "steamapps", f"appmanifest_{app_id}.acf")
-    if os.path.isfile(old_acf):
-        try:
-            os.remove(old_acf)
-            print(f"🧹 Old ACF manifest deleted.")
-        except Exception:
-            pass
+        _prog(0.70, "Cleaning up...")
+        _remove_old_acf(app_id)
 
     print(f"\n📊 Result: Lua ✅ | Source: Gamelist Repo")
 
@@ -280,19 +1005,89 @@ def add_shortcut_from_manifest(app_id, app_name, on_progress=None, auto_restart=
         print("  ℹ️ Manual restart selected.")
         _prog(0.85, "Done! Please restart Steam manually.")
 
-    if system_ok:
-        return True, (
-            f"'{app_name}' (AppID: {app_id}) successfully added!\n"
-            f"Source: Gamelist Repo\n"
-            f"Lua: stplug-in/{app_id}.lua ✅\n\n"
-            f"Please restart Steam to see it in your library."
-        )
-    else:
-        return True, (
-            f"Files placed but {XINPUT_DLL_NAME} is missing!\n\n"
-            f"Reinstall GameInSteam setup or restart the app as Administrator.\n"
-            f"Then restart Steam."
-        )
+    return True, _added_message(app_id, app_name, system_ok)
+
+
+def add_games_batch(app_ids, names=None, on_item=None, on_progress=None,
+                    auto_restart=False, max_workers=BATCH_MAX_WORKERS):
+    """
+    Birden fazla oyunu tek seferde ekler.
+
+    - Sistem kontrolü batch başına bir kez yapılır.
+    - Zip indirmeleri sınırlı bir thread havuzunda koşar; N. oyunun lua'sı
+      yazılırken N+1. oyunun indirmesi devam eder.
+    - Her AppID kendi kilidi altında yazılır (update/remove ile çakışmaz).
+    - auto_restart ise en sonda en fazla bir kez Steam yeniden başlatılır.
+
+    names:       dict app_id -> görünen ad (opsiyonel)
+    on_item:     callable(index: int, app_id: str, ok: bool, msg: str)
+    on_progress: callable(pct: float, msg: str) — toplam ilerleme
+
+    Returns: list of (app_id, ok, msg)
+    """
+    app_ids = [str(a) for a in app_ids]
+    names = names or {}
+    total = len(app_ids)
+    results = []
+    if not total:
+        return results
+
+    def _prog(pct, msg=""):
+        if on_progress:
+            on_progress(pct, msg)
+
+    _prog(0.02, "Checking system...")
+    system_ok = _prepare_system()
+    setup_dirs()
+
+    # Önde en fazla 2*max_workers indirme tutulur; bellek batch boyutuyla büyümez
+    window = max(1, max_workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, max_workers),
+                            thread_name_prefix="gamelist-dl") as pool:
+        pending = deque()
+        next_idx = 0
+        while next_idx < total and len(pending) < window:
+            pending.append(pool.submit(fetch_gamelist_zip_cached, app_ids[next_idx]))
+            next_idx += 1
+
+        for idx, app_id in enumerate(app_ids):
+            _prog(0.05 + 0.85 * idx / total, f"[{idx + 1}/{total}] Downloading AppID {app_id}...")
+            try:
+                zip_buf, _, fetched = pending.popleft().result()
+            except Exception as e:
+                zip_buf = None
+                print(f"  ⚠️ Gamelist error: {type(e).__name__}: {e}")
+            if next_idx < total:
+                pending.append(pool.submit(fetch_gamelist_zip_cached, app_ids[next_idx]))
+                next_idx += 1
+
+            if zip_buf is None:
+                ok, msg = False, _not_found_message(app_id)
+            else:
+                with app_lock(app_id):
+                    # Önbelleğe de yazılır: ilk güncelleme If-None-Match ile gider
+                    lua_path = install_cached_zip(app_id, zip_buf, fetched)
+                    if lua_path:
+                        _remove_old_acf(app_id)
+                if lua_path:
+                    ok = True
+                    msg = _added_message(app_id, names.get(app_id) or f"Game_{app_id}", system_ok)
+                else:
+                    ok, msg = False, _not_found_message(app_id)
+
+            results.append((app_id, ok, msg))
+            if on_item:
+                on_item(idx, app_id, ok, msg)
+
+    ok_n = sum(1 for _, ok, _ in results if ok)
+    print(f"\n📊 Batch result: {ok_n}/{total} added | Source: Gamelist Repo")
+
+    if auto_restart and ok_n:
+        _prog(0.92, "Restarting Steam...")
+        if not restart_steam():
+            print("❌ Steam.exe not found!")
+    _prog(1.0, f"{ok_n}/{total} game(s) added.")
+    return results
 
 
 # =============================================================================
@@ -301,7 +1096,7 @@ def add_shortcut_from_manifest(app_id, app_name, on_progress=None, auto_restart=
 def get_game_name_from_steam(app_id):
     """Steam Store API'den oyun adını çeker."""
     try:
-        resp = requests.get(
+        resp = http_client.get(
             STEAM_API_URL,
             params={"appids": str(app_id), "filters": "basic"},
             timeout=8,
@@ -315,27 +1110,442 @@ def get_game_name_from_steam(app_id):
     return ""
 
 
+class NameResolver:
+    """
+    get_game_name_from_steam etrafinda paylasilan isim servisi.
+
+    - Ayni AppID icin ayni anda yalnizca bir istek yapilir (single-flight);
+      sonradan gelenler ayni Future'i bekler.
+    - Istekler max_concurrency boyutlu kendi havuzunda, ya da verilen
+      executor'da (ör. UI'nin FetchScheduler'i) calisir.
+    - Sonuclar (bulunamayanlar dahil) oturum boyunca cache'te kalir; boylece
+      her benzersiz AppID icin en fazla bir Store API cagrisi yapilir.
+    - store (MetadataStore) verilirse isimler acilista diskten yuklenir;
+      suresi dolmus (stale) isimler hemen dondurulur ve arka planda yenilenir.
+
+    cache: app_id -> isim sozlugu (UI'nin _name_cache'i bu nesnedir).
+    """
+
+    def __init__(self, max_concurrency: int = 4, cache: dict | None = None, store=None,
+                 executor=None):
+        self.cache: dict[str, str] = cache if cache is not None else {}
+        self._store = store
+        self._stale: set[str] = set()
+        self._misses: set[str] = set()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._owns_pool = executor is None
+        self._pool = executor or ThreadPoolExecutor(max_workers=max(1, max_concurrency),
+                                                    thread_name_prefix="name-lookup")
+        if store is not None:
+            for app_id, (name, stale) in store.get_many("name").items():
+                if name:
+                    self.cache[app_id] = name
+                    if stale:
+                        self._stale.add(app_id)
+
+    def _lookup(self, app_id: str) -> str:
+        try:
+            name = get_game_name_from_steam(app_id)
+        finally:
+            with self._lock:
+                self._inflight.pop(app_id, None)
+        with self._lock:
+            self._stale.discard(app_id)   # oturumda bir kez yenilemek yeterli
+            if name:
+                self.cache[app_id] = name
+            elif app_id not in self.cache:
+                self._misses.add(app_id)
+        if name and self._store is not None:
+            self._store.put("name", app_id, name)
+        return name
+
+    def _submit(self, app_id: str) -> Future:
+        # self._lock altinda cagrilir
+        fut = self._inflight.get(app_id)
+        if fut is None:
+            fut = self._pool.submit(self._lookup, app_id)
+            self._inflight[app_id] = fut
+        return fut
+
+    def resolve_async(self, app_id, callback=None) -> Future:
+        """
+        Ismi arka planda cozer. callback(app_id, name) sonuc gelince
+        havuz thread'inden cagrilir (isim bulunamazsa name == "").
+        """
+        app_id = str(app_id)
+        revalidate = None
+        with self._lock:
+            if app_id in self.cache or app_id in self._misses:
+                fut = Future()
+                fut.set_result(self.cache.get(app_id, ""))
+                if app_id in self._stale:
+                    revalidate = self._submit(app_id)
+            else:
+                fut = self._submit(app_id)
+        if callback:
+            def _done(f, a=app_id):
+                try:
+                    name = f.result()
+                except Exception:
+                    name = ""
+                callback(a, name)
+            fut.add_done_callback(_done)
+        if callback and revalidate is not None:
+            # Eski isim yukarida hemen verildi; yenisi farkliysa callback bir kez daha cagrilir
+            old = fut.result()
+            def _changed(f, a=app_id):
+                try:
+                    name = f.result()
+                except Exception:
+                    return
+                if name and name != old:
+                    callback(a, name)
+            revalidate.add_done_callback(_changed)
+        return fut
+
+    def resolve(self, app_id, timeout: float | None = None) -> str:
+        """Bloklayan cozum (worker thread'lerinden kullanilir)."""
+        try:
+            return self.resolve_async(app_id).result(timeout)
+        except Exception:
+            return self.cache.get(str(app_id), "")
+
+    def resolve_many(self, app_ids, on_each=None) -> dict[str, Future]:
+        """Toplu cozum: her AppID icin (tekillestirilmis) Future doner; on_each her sonucta cagrilir."""
+        return {str(a): self.resolve_async(a, on_each) for a in dict.fromkeys(map(str, app_ids))}
+
+    def clear_misses(self):
+        """Bulunamayan isimleri tekrar denenebilir yapar (ör. baglanti geri geldiginde)."""
+        with self._lock:
+            self._misses.clear()
+
+    def shutdown(self):
+        if self._owns_pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def search_store(term: str, limit: int = 6) -> list[dict]:
+    """Steam mağaza araması. Returns: items listesi (id, name, ...). Hata durumunda exception."""
+    resp = http_client.get(
+        STORE_SEARCH_URL,
+        params={"term": term, "l": "english", "cc": "US"},
+        timeout=5,
+    )
+    return resp.json().get("items", [])[:limit]
+
+
+class StoreSearch:
+    """
+    Quick Find arama servisi.
+
+    - Sonuçlar sorgu -> items LRU önbelleğinde (ttl saniye) tutulur; aynı sorguya
+      geri dönmek (backspace, tekrar yazma) ağa gitmez.
+    - Her search() yeni bir nesil (generation) açar; sadece en yeni neslin sonucu
+      callback'e iletilir, eskiler sessizce düşer. Henüz başlamamış eski istekler
+      iptal edilir.
+    - Uzun sorgu beklenirken, önbellekteki en uzun kısa sorgunun sonucu yeni
+      metne göre süzülüp önizleme (final=False) olarak hemen verilir.
+
+    callback(gen, query, items, final) — items None ise istek başarısız olmuştur.
+    """
+
+    def __init__(self, cache_size: int = 64, ttl: float = 600, limit: int = 6,
+                 executor=None, submit_opts: dict | None = None):
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self.limit = limit
+        self._cache: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.RLock()   # Future.cancel() done-callback'leri ayni thread'de calistirir
+        self._gen = 0
+        self._owns_pool = executor is None
+        self._pool = executor or ThreadPoolExecutor(max_workers=2,
+                                                    thread_name_prefix="store-search")
+        self._submit_opts = submit_opts or {}
+
+    @property
+    def generation(self) -> int:
+        return self._gen
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _cached(self, key: str):
+        # self._lock altinda cagrilir
+        hit = self._cache.get(key)
+        if hit is None or time.time() - hit[0] > self.ttl:
+            return None
+        self._cache.move_to_end(key)
+        return hit[1]
+
+    def _preview(self, key: str):
+        words = key.split()
+        for n in range(len(key) - 1, 0, -1):
+            items = self._cached(key[:n])
+            if items is not None:
+                return [i for i in items
+                        if all(w in str(i.get("name", "")).lower() for w in words)] or None
+        return None
+
+    def _store(self, key: str, fut: Future):
+        with self._lock:
+            if self._pending.get(key) is fut:
+                del self._pending[key]
+            if fut.cancelled() or fut.exception() is not None:
+                return
+            self._cache[key] = (time.time(), fut.result())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _drop_queued(self, keep: str | None = None):
+        # self._lock altinda cagrilir; calismaya baslamis istekler bitince sadece onbellege yazilir
+        for key, fut in list(self._pending.items()):
+            if key != keep and fut.cancel():
+                self._pending.pop(key, None)
+
+    def has(self, query: str) -> bool:
+        """Sorgunun taze sonucu önbellekte mi (debounce'u atlamak için)."""
+        with self._lock:
+            return self._cached(self._key(query)) is not None
+
+    def search(self, query: str, callback) -> int:
+        """Aramayı başlatır ve bu aramanın nesil numarasını döner."""
+        key = self._key(query)
+        with self._lock:
+            self._gen += 1
+            gen = self._gen
+            hit = self._cached(key)
+            preview = None if hit is not None else self._preview(key)
+            self._drop_queued(keep=key)
+        if hit is not None:
+            callback(gen, query, hit, True)
+            return gen
+        if preview:
+            callback(gen, query, preview, False)
+
+        with self._lock:
+            fut = self._pending.get(key)
+            if fut is None:
+                fut = self._pool.submit(search_store, key, self.limit, **self._submit_opts)
+                self._pending[key] = fut
+                fut.add_done_callback(lambda f, k=key: self._store(k, f))
+
+        def _deliver(f):
+            if f.cancelled() or gen != self._gen:
+                return   # daha yeni bir arama var
+            callback(gen, query, None if f.exception() else f.result(), True)
+        fut.add_done_callback(_deliver)
+        return gen
+
+    def cancel(self):
+        """Bekleyen aramaları geçersiz kılar (ör. arama kutusu temizlendiğinde)."""
+        with self._lock:
+            self._gen += 1
+            self._drop_queued()
+
+    def shutdown(self):
+        if self._owns_pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class LibraryIndex:
+    """
+    stplug-in dizinindeki {app_id}.lua dosyalarinin kalici indeksi.
+
+    Dizin yalnizca imzasi (dizinin mtime'i) degistiginde os.scandir ile yeniden
+    taranir; sonuc uygulama veri dizinine yazilir, boylece acilista da tarama
+    yapilmaz. Sayi, uyelik, mtime'a gore ilk N ve sayfali liste taramasiz cevaplanir.
+    """
+
+    def __init__(self, directory: str, cache_path: str):
+        self.directory = directory
+        self.cache_path = cache_path
+        self._lock = threading.RLock()
+        self._entries: dict[str, float] = {}
+        self._sorted_ids: list[str] = []
+        self._signature = None
+        self.version = 0  # girdiler her degistiginde artar (izleyiciler icin)
+        self._load()
+
+    def _load(self):
+        data = _read_json(self.cache_path)
+        if not isinstance(data, dict) or data.get("directory") != self.directory:
+            return
+        self._entries = {str(k): float(v) for k, v in data.get("entries", {}).items()}
+        self._sorted_ids = sorted(self._entries, key=lambda a: f"{a}.lua")
+        self._signature = data.get("signature")
+
+    def _save(self):
+        try:
+            _atomic_write_json(self.cache_path, {"directory": self.directory,
+                                                 "signature": self._signature,
+                                                 "entries": self._entries})
+        except Exception as e:
+            print(f"⚠️ Library index could not be saved: {e}")
+
+    def refresh(self, force: bool = False) -> bool:
+        """Dizin degistiyse yeniden tarar. Returns: indeks degistiyse True"""
+        with self._lock:
+            sig = _dir_signature(self.directory)
+            if not force and sig == self._signature:
+                return False
+
+            # Imza taramadan ONCE alinir: tarama sirasinda gelen degisiklik
+            # bir sonraki refresh'te tekrar tarama tetikler.
+            entries: dict[str, float] = {}
+            if sig is not None:
+                try:
+                    with os.scandir(self.directory) as it:
+                        for entry in it:
+                            name = entry.name
+                            if not name.endswith(".lua") or not name[:-4].isdigit():
+                                continue
+                            try:
+                                entries[name[:-4]] = entry.stat().st_mtime
+                            except OSError:
+                                continue
+                except OSError:
+                    pass
+
+            changed = entries != self._entries
+            if changed:
+                self.version += 1
+                self._entries = entries
+                self._sorted_ids = sorted(entries, key=lambda a: f"{a}.lua")
+            if changed or sig != self._signature:   # zorunlu taramalar diske yazmaz
+                self._signature = sig
+                self._save()
+            return changed
+
+    def count(self) -> int:
+        self.refresh()
+        return len(self._entries)
+
+    def __contains__(self, app_id) -> bool:
+        self.refresh()
+        return str(app_id) in self._entries
+
+    def snapshot(self) -> dict[str, float]:
+        """app_id -> mtime kopyasi."""
+        self.refresh()
+        with self._lock:
+            return dict(self._entries)
+
+    def page(self, offset: int = 0, limit: int | None = None) -> list[dict]:
+        self.refresh()
+        with self._lock:
+            ids = self._sorted_ids[offset:None if limit is None else offset + limit]
+            return [{"app_id": a, "mtime": self._entries[a]} for a in ids]
+
+    def top_recent(self, limit: int) -> list[dict]:
+        self.refresh()
+        with self._lock:
+            top = heapq.nlargest(limit, self._entries.items(), key=lambda kv: kv[1])
+        return [{"app_id": a, "mtime": m} for a, m in top]
+
+
+_library_index: LibraryIndex | None = None
+_library_index_lock = threading.Lock()
+
+
+def get_library_index() -> LibraryIndex:
+    """Gecerli stplug-in dizinine ait indeksi dondurur (Steam ortami degisirse yenisi)."""
+    global _library_index
+    stplugin_dir = get_stplugin_dir()
+    with _library_index_lock:
+        if _library_index is None or _library_index.directory != stplugin_dir:
+            _library_index = LibraryIndex(
+                stplugin_dir, os.path.join(get_app_data_dir(), "library_index.json"))
+        return _library_index
+
+
+class StpluginWatcher:
+    """
+    stplug-in dizinini arka planda izler ve AppID bazinda degisiklikleri bildirir.
+
+    Her turda sadece dizin imzasi kontrol edilir (tek os.stat); yerinde
+    duzenlenen dosyalari yakalamak icin her full_scan_every turda bir tam
+    tarama yapilir. Inotify vb. gerektirmez, Linux test makinelerinde de calisir.
+
+    on_change: callable({"added": [...], "removed": [...], "modified": [...]})
+               — izleyici thread'inden cagrilir.
+    """
+
+    def __init__(self, on_change, interval: float = 1.0, full_scan_every: int = 10):
+        self.on_change = on_change
+        self.interval = interval
+        self.full_scan_every = max(1, full_scan_every)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last: dict[str, float] = {}
+        self._index: LibraryIndex | None = None
+        self._version = -1
+        self._poll_lock = threading.Lock()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._index = get_library_index()
+        self._last = self._index.snapshot()
+        self._version = self._index.version
+        self._thread = threading.Thread(target=self._run, name="stplugin-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll(self, force: bool = False) -> dict | None:
+        """Tek tur kontrol. Degisiklik varsa diff'i dondurur (ve on_change'i cagirir)."""
+        with self._poll_lock:
+            index = get_library_index()
+            index.refresh(force=force)
+            # Indeksi baska bir cagri (ör. UI sayaci) yenilemis olabilir; surum numarasi yeterli
+            if index is self._index and index.version == self._version:
+                return None
+            self._index, self._version = index, index.version
+            current = index.snapshot()
+            prev, self._last = self._last, current
+        diff = {
+            "added":    sorted(a for a in current if a not in prev),
+            "removed":  sorted(a for a in prev if a not in current),
+            "modified": sorted(a for a in current if a in prev and current[a] != prev[a]),
+        }
+        if not any(diff.values()):
+            return None
+        try:
+            self.on_change(diff)
+        except Exception as e:
+            print(f"⚠️ Watcher callback error: {type(e).__name__}: {e}")
+        return diff
+
+    def _run(self):
+        tick = 0
+        while not self._stop.wait(self.interval):
+            tick += 1
+            try:
+                self.poll(force=tick % self.full_scan_every == 0)
+            except Exception as e:
+                print(f"⚠️ Watcher error: {type(e).__name__}: {e}")
+
+
 def list_added_games():
     """
-    stplug-in dizinindeki lua dosyalarını tarayarak eklenmiş oyunları listeler.
+    stplug-in dizinindeki lua dosyalarını listeler (indeks üzerinden).
 
     Returns: list of dict with keys: app_id, mtime
     """
-    games = []
-    stplugin_dir = get_stplugin_dir()
-    if not os.path.isdir(stplugin_dir):
-        return games
+    return get_library_index().page()
 
-    for lua_file in sorted(glob.glob(os.path.join(stplugin_dir, "*.lua"))):
-        name_part = os.path.splitext(os.path.basename(lua_file))[0]
-        if not name_part.isdigit():
-            continue
-        games.append({
-            "app_id": name_part,
-            "mtime": os.path.getmtime(lua_file),
-        })
 
-    return games
+def count_added_games() -> int:
+    return get_library_index().count()
 
 
 def list_recent_games(limit: int = 20):
@@ -344,9 +1554,7 @@ def list_recent_games(limit: int = 20):
 
     Returns: list of dict (en yeni → en eski)
     """
-    games = list_added_games()
-    games.sort(key=lambda g: g.get("mtime", 0), reverse=True)
-    return games[:limit]
+    return get_library_index().top_recent(limit)
 
 
 def remove_game(app_id):
@@ -358,15 +1566,15 @@ def remove_game(app_id):
     app_id = str(app_id)
     removed = []
 
-    lua_path = os.path.join(get_stplugin_dir(), f"{app_id}.lua")
-    if os.path.isfile(lua_path):
-        os.remove(lua_path)
-        removed.append(f"stplug-in/{app_id}.lua")
+    with app_lock(app_id):
+        lua_path = os.path.join(get_stplugin_dir(), f"{app_id}.lua")
+        if os.path.isfile(lua_path):
+            os.remove(lua_path)
+            removed.append(f"stplug-in/{app_id}.lua")
 
-    acf_path = os.path.join(get_steam_path(), "steamapps", f"appmanifest_{app_id}.acf")
-    if os.path.isfile(acf_path):
-        os.remove(acf_path)
-        removed.append(f"appmanifest_{app_id}.acf")
+        for acf_path in get_steam_env().acf_paths(app_id):
+            os.remove(acf_path)
+            removed.append(f"appmanifest_{app_id}.acf")
 
     if removed:
         print(f"🗑️ Deleted files: {', '.join(removed)}")
@@ -380,8 +1588,10 @@ def is_game_in_repo(app_id: str) -> bool:
     AppID'nin gamelist repoda olup olmadığını hızlıca kontrol eder (HEAD isteği).
     Hata durumunda True döner (kullanıcıyı engelleme).
     """
+    if gamelist_entry(app_id) is not None:
+        return True  # taze manifestte var, HEAD gerekmez
     try:
-        resp = requests.head(
+        resp = http_client.head(
             f"{GAMELIST_BASE_URL}/{app_id}.zip",
             timeout=6,
         )
@@ -393,31 +1603,13 @@ def is_game_in_repo(app_id: str) -> bool:
 def get_gamelist_repo_games():
     """
     kakies13/gamelist reposundaki mevcut tüm oyunları listeler.
-    GitHub Contents API'den zip dosya adlarını çeker ve AppID'leri döner.
+    Listeyi tazeler (manifest.json veya git trees API, ETag ile); ağ hatasında
+    diskteki son liste döner.
 
     Returns: list of str (app_id'ler) veya boş liste
     """
-    try:
-        resp = requests.get(
-            "https://api.github.com/repos/kakies13/gamelist/contents",
-            timeout=15,
-            headers={"Accept": "application/vnd.github.v3+json"},
-        )
-        if resp.status_code != 200:
-            print(f"⚠️ Gamelist API error: HTTP {resp.status_code}")
-            return []
-        data = resp.json()
-        app_ids = []
-        for item in data:
-            name = item.get("name", "")
-            if name.endswith(".zip"):
-                app_id = name[:-4]
-                if app_id.isdigit():
-                    app_ids.append(app_id)
-        return sorted(app_ids, key=lambda x: int(x))
-    except Exception as e:
-        print(f"⚠️ Gamelist repo fetch error: {type(e).__name__}: {e}")
-        return []
+    sync_gamelist_manifest()
+    return get_cached_gamelist_games()
 
 
 def update_game(app_id):
@@ -429,12 +1621,37 @@ def update_game(app_id):
     app_id = str(app_id)
     print(f"🔄 Updating AppID {app_id}...")
 
-    old_lua = os.path.join(get_stplugin_dir(), f"{app_id}.lua")
-    if os.path.isfile(old_lua):
-        os.remove(old_lua)
-        print(f"  🧹 Old lua deleted.")
+    lua_dest = os.path.join(get_stplugin_dir(), f"{app_id}.lua")
+    installed = os.path.isfile(lua_dest)
+    entry = gamelist_entry(app_id)
+    if (entry and entry.get("sha") and installed
+            and entry["sha"] == cached_zip_git_sha(app_id)):
+        print(f"✅ Already up to date (manifest SHA matches).")
+        return True, f"AppID {app_id} is already up to date.\nSource: Gamelist Repo"
+
+    # İndirme kilit dışında yapılır; remove_game (Tk thread'i) indirme boyunca beklemez
+    zip_buf, changed, fetched = fetch_gamelist_zip_cached(app_id)
+
+    if zip_buf is None:
+        return False, (
+            f"AppID {app_id} could not be updated!\n"
+            "Not found in gamelist repo."
+        )
+
+    with app_lock(app_id):
+        if installed and not os.path.isfile(lua_dest):
+            # İndirme sürerken kaldırıldı: oyunu geri ekleme
+            zip_buf.close()
+            _discard_cached_zip(fetched)
+            return False, f"AppID {app_id} was removed during the update."
+
+        if not changed and os.path.isfile(lua_dest):
+            zip_buf.close()
+            print(f"✅ Already up to date.")
+            return True, f"AppID {app_id} is already up to date.\nSource: Gamelist Repo"
 
-    lua_path = download_from_gamelist(app_id)
+        # Eski lua, yenisi çıkarılıp doğrulanana kadar yerinde kalır (atomik replace)
+        lua_path = install_cached_zip(app_id, zip_buf, fetched)
 
     if lua_path:
         print(f"✅ Update completed!")
@@ -442,5 +1659,134 @@ def update_game(app_id):
     else:
         return False, (
             f"AppID {app_id} could not be updated!\n"
-            "Not found in gamelist repo."
+            "The downloaded archive did not contain a valid lua file."
         )
+
+
+# =============================================================================
+# 7. MODÜL: DENUVO KÜRATÖR LİSTESİ
+# =============================================================================
+DENUVO_CURATOR_URL = (
+    "https://store.steampowered.com/curator/26095454-Denuvo-Games/"
+    "ajaxgetfilteredrecommendations/render/"
+)
+DENUVO_PAGE_SIZE = 1000
+DENUVO_MAX_PAGES = 50
+DENUVO_TTL = 86400
+_CURATOR_APPID_RE = re.compile(r'(?:data-ds-appid="|store\.steampowered\.com/app/)(\d+)')
+
+
+def fetch_denuvo_app_ids():
+    """
+    Denuvo küratör listesini sayfa sayfa çeker (count=1000 sınırının ötesine geçer).
+
+    Returns: set of str (app_id'ler) veya None (ağ hatası)
+    """
+    app_ids: set[str] = set()
+    start = 0
+    for _ in range(DENUVO_MAX_PAGES):
+        try:
+            resp = http_client.get(
+                DENUVO_CURATOR_URL,
+                params={"start": start, "count": DENUVO_PAGE_SIZE},
+                timeout=15,
+            )
+            data = resp.json()
+        except Exception as e:
+            print(f"⚠️ Denuvo curator fetch error: {type(e).__name__}: {e}")
+            return None
+        found = set(_CURATOR_APPID_RE.findall(data.get("results_html", "")))
+        if not found - app_ids:
+            break
+        app_ids |= found
+        start += DENUVO_PAGE_SIZE
+        if start >= int(data.get("total_count") or 0):
+            break
+    return app_ids
+
+
+class DenuvoCuratorSet:
+    """
+    Denuvo küratör listesinin AppID kümesi.
+
+    Açılışta diskteki kopya yüklenir; TTL dolmuşsa liste arka planda tek
+    seferde yeniden çekilir. `app_id in denuvo` ağa hiç gitmez (O(1)).
+    """
+
+    def __init__(self, cache_path: str, ttl: float = DENUVO_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.fetched = 0.0
+        self._ids: frozenset[str] = frozenset()
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._refreshing = False
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._ids = frozenset(data.get("app_ids", []))
+            self.fetched = float(data.get("fetched", 0))
+            self._loaded.set()
+        except Exception:
+            pass
+
+    def __contains__(self, app_id) -> bool:
+        return str(app_id) in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def stale(self) -> bool:
+        return time.time() - self.fetched > self.ttl
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """İlk liste gelene kadar bekler (disk kopyası varsa hemen döner)."""
+        return self._loaded.wait(timeout)
+
+    def refresh(self) -> bool:
+        """Listeyi ağdan çeker ve diske yazar. Returns: başarılı mı"""
+        ids = fetch_denuvo_app_ids()
+        if ids is None:
+            return False
+        with self._lock:
+            self._ids = frozenset(ids)
+            self.fetched = time.time()
+        try:
+            _atomic_write_json(self.cache_path, {"fetched": self.fetched, "app_ids": sorted(ids)})
+        except Exception as e:
+            print(f"  ⚠️ Denuvo list could not be saved: {e}")
+        return True
+
+    def refresh_async(self, force: bool = False, on_done=None):
+        """
+        Liste bayatsa (veya force) arka planda tazeler; aynı anda tek istek çalışır.
+        on_done(changed: bool) worker thread'inden çağrılır.
+        """
+        with self._lock:
+            if self._refreshing or not (force or self.stale):
+                return
+            self._refreshing = True
+
+        def _run():
+            before = self._ids
+            try:
+                ok = self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+                self._loaded.set()   # hata olsa da bekleyenleri bırak
+            if on_done:
+                on_done(ok and self._ids != before)
+
+        threading.Thread(target=_run, daemon=True, name="denuvo-refresh").start()
+
+
+_denuvo_set: DenuvoCuratorSet | None = None
+
+
+def get_denuvo_set() -> DenuvoCuratorSet:
+    global _denuvo_set
+    if _denuvo_set is None:
+        _denuvo_set = DenuvoCuratorSet(os.path.join(get_app_data_dir(), "denuvo_appids.json"))
+    return _denuvo_set
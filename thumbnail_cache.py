@@ -0,0 +1,111 @@
+"""
+GameInSteam — Thumbnail cache
+Header images stored already resized, as binary PPM files that Tk can load
+directly (no network, no JPEG decode, no resample on a cache hit).
+"""
+
+import io
+import os
+import threading
+import time
+
+DAY = 86400
+DEFAULT_SIZE = (184, 86)
+DEFAULT_TTL = 14 * DAY   # stale thumbnails are still shown, then refreshed
+
+
+class ThumbnailCache:
+    """
+    One file per (AppID, size): {app_id}_{w}x{h}.ppm
+
+    The PPM header carries a "# src <bytes>" comment with the size of the
+    original header.jpg, so hits can be reported as bytes saved.
+    """
+
+    def __init__(self, directory: str, size: tuple[int, int] = DEFAULT_SIZE,
+                 ttl: float = DEFAULT_TTL):
+        self.directory = directory
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, app_id, size: tuple[int, int] | None = None) -> str:
+        w, h = size or self.size
+        return os.path.join(self.directory, f"{app_id}_{w}x{h}.ppm")
+
+    @staticmethod
+    def _source_bytes(path: str) -> int:
+        try:
+            with open(path, "rb") as f:
+                head = f.read(64).split(b"\n")
+            if len(head) > 1 and head[1].startswith(b"# src "):
+                return int(head[1][6:])
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    def get(self, app_id, size: tuple[int, int] | None = None) -> tuple[str | None, bool]:
+        """
+        Returns (path, stale). path is None on a miss.
+        Stale entries are returned too; the caller refreshes them in the background.
+        """
+        path = self.path(app_id, size)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None, True
+        stale = time.time() - mtime > self.ttl
+        # A stale entry is downloaded again by the caller, so it saves nothing
+        saved = 0 if stale else self._source_bytes(path)
+        with self._lock:
+            self._hits += 1
+            self._bytes_saved += saved
+        return path, stale
+
+    def put(self, app_id, raw: bytes, size: tuple[int, int] | None = None) -> str | None:
+        """Decodes + resizes the original image once and stores it. Returns the path."""
+        from PIL import Image  # only needed on a miss
+
+        w, h = size or self.size
+        path = self.path(app_id, (w, h))
+        try:
+            with Image.open(io.BytesIO(raw)) as src:
+                img = src.convert("RGB").resize((w, h), Image.LANCZOS)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(b"P6\n# src %d\n%d %d\n255\n" % (len(raw), w, h))
+                f.write(img.tobytes())
+            os.replace(tmp, path)
+            return path
+        except Exception as e:
+            print(f"⚠️ Thumbnail cache write failed for {app_id}: {e}")
+            return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "bytes_saved": self._bytes_saved,
+            }
+
+    def disk_usage(self) -> tuple[int, int]:
+        """(file count, total bytes) of the cache directory."""
+        count = size = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".ppm"):
+                        count += 1
+                        size += entry.stat().st_size
+        except OSError:
+            pass
+        return count, size
@@ -2,36 +2,57 @@ import os
 import json
 import time
 import threading
-import requests  # type: ignore
-import io
 import webbrowser
+from collections import OrderedDict
+from functools import cached_property
 import customtkinter as ctk  # type: ignore
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageDraw, ImageTk  # type: ignore
-from typing import Any
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL import Image  # type: ignore
+
+import http_client  # type: ignore
+from metadata_store import MetadataStore  # type: ignore
+from thumbnail_cache import ThumbnailCache  # type: ignore
+from scheduler import (  # type: ignore
+    FetchScheduler, PRIORITY_USER, PRIORITY_VISIBLE, PRIORITY_PREFETCH,
+)
+from virtual_list import VirtualList  # type: ignore
+from search_index import SearchIndex  # type: ignore
+from drm_status import DrmStatusService  # type: ignore
 
 try:
     from steam_handler import (  # type: ignore
-        check_stplugin_system, install_stplugin_dll, add_shortcut_from_manifest,
+        check_stplugin_system, install_stplugin_dll,
         list_added_games, list_recent_games, remove_game, update_game,
-        get_game_name_from_steam, restart_steam, get_gamelist_repo_games,
-        is_game_in_repo,
+        NameResolver, StoreSearch, restart_steam, get_cached_gamelist_games, sync_gamelist_manifest,
+        add_games_batch, invalidate_steam_env,
+        count_added_games, StpluginWatcher, get_app_data_dir, get_denuvo_set,
+        is_game_in_repo, gamelist_manifest_fresh,
     )
 except ImportError:
     print("Error: steam_handler.py not found!")
 
 try:
-    from updater import check_for_update, download_update, apply_update, CURRENT_VERSION  # type: ignore
+    from updater import (  # type: ignore
+        check_for_update, fetch_update, apply_update, CURRENT_VERSION, prefetch_update,
+    )
 except ImportError:
     CURRENT_VERSION = "5.0"
-    def check_for_update(): return None
-    def download_update(*a): return None
+    def check_for_update(force=False): return None
+    def fetch_update(*a, **k): return None
     def apply_update(*a): pass
+    def prefetch_update(*a, **k): return None
 
 CONFIG_FILE = "config.json"
 HEADER_URL  = "https://cdn.akamai.steamstatic.com/steam/apps/{}/header.jpg"
 IMG_W, IMG_H = 184, 86
+RECENT_LIMIT = 30
+VISIBLE_CARDS = 8   # ilk N kart "gorunur" onceligiyle, kalanlar prefetch olarak yuklenir
+AVAIL_ROW_H   = 126 # Available Games satir yuksekligi (kart 116 + 10 bosluk)
+IMG_CACHE_SIZE = 96 # bellekte tutulan kapak (PhotoImage) sayisi; gerisi disk onbelleginden
 DEFAULT_WEBHOOK_URL = ""
 
 SPIN_FRAMES = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
@@ -66,8 +87,19 @@ def _smoothstep(t: float) -> float:
     return t * t * (3.0 - 2.0 * t)
 
 
-def _solid_placeholder(w: int, h: int, bg: str, text: str, text_color: str) -> Image.Image:
+def _drm_categories(st: dict | None) -> tuple[str, ...]:
+    """Kutuphane filtresindeki kategoriler (durumu bilinmeyen oyun "Protected" sayilir)."""
+    st   = st or {}
+    if st.get("found") is False: return ("Clean / No DRM",)   # gamestatus.info'da yok
+    cats = ["Cracked"] if st.get("cracked") else []
+    if st.get("protection") == "Unknown":  cats.append("Clean / No DRM")
+    elif not st.get("cracked"):            cats.append("Protected")
+    return tuple(cats)
+
+
+def _solid_placeholder(w: int, h: int, bg: str, text: str, text_color: str) -> "Image.Image":
     """Oyun kapagi yokken duz renkli placeholder (canvas artefakti yok)."""
+    from PIL import Image, ImageDraw  # type: ignore
     img = Image.new("RGB", (w, h), bg)
     draw = ImageDraw.Draw(img)
     draw.rectangle([0, 0, w - 1, h - 1], outline="#D1D1D6", width=1)
@@ -78,7 +110,8 @@ def _solid_placeholder(w: int, h: int, bg: str, text: str, text_color: str) -> I
 # ──────────────────────────────────────────────────────────────────────────────
 class GameInSteamApp(ctk.CTk):
 
-    def __init__(self):
+    def __init__(self, started: float | None = None):
+        self._t_start = started or time.perf_counter()
         super().__init__()
         self.title("GameInSteam")
         self.geometry("1180x760")
@@ -118,15 +151,24 @@ class GameInSteamApp(ctk.CTk):
         self._anim_ms       = 5
         self._anim_steps    = 6
         self._nav_items: list[ctk.CTkFrame] = []
+        self._pages:     dict[str,Any] = {}   # sayfalar ilk acildiklarinda kurulur (_page)
 
         self.configure(fg_color=self.c_bg)
 
         # ── STATE ─────────────────────────────────────────────────────────────
-        self._name_cache:          dict[str,str]  = {}
-        self._img_cache:           dict[str,Any]  = {}
-        self._crack_cache:         dict[str,Any]  = {}
+        # Servisler (_meta, _thumbs, _sched, _names, _drm, _denuvo, _search) asagidaki
+        # lazy property'lerle ilk kullanimda, en gec _after_first_paint'te kurulur
+        self._img_cache:           OrderedDict     = OrderedDict()   # LRU, IMG_CACHE_SIZE
+        self._search_items:        list[dict]      = []
         self._available_games:     list[str]       = []
         self._available_loaded                      = False
+        self._lib_cards:           dict[str,Any]   = {}
+        self._lib_loaded                            = False
+        self._lib_search                            = SearchIndex()
+        self._lib_visible:         set[str]        = set()
+        self._avail_search                          = SearchIndex()
+        self._recent_cards:        dict[str,Any]   = {}
+        self._recent_loaded                         = False
         self._busy                                  = False
         self._spinner_active                        = False
         self._config:              dict[str,Any]   = self._load_config()
@@ -136,17 +178,100 @@ class GameInSteamApp(ctk.CTk):
         self._update_checking    = False
         self._update_dialog_open = False
         self._update_info        = None
+        self._update_staged      = None   # arka plan on-indirmesinin dogrulanmis installer yolu
+        self._prefetch_stop      = threading.Event()
+
+        self._empty_photo                           = None
+        self._startup_ms:          dict[str,float] = {}
 
-        # Fallback thumbnail (solid — no stripe artifacts)
-        fb = _solid_placeholder(IMG_W, IMG_H, self.c_card_hi, "NO IMG", self.c_text_dim)
-        self._empty_img = ImageTk.PhotoImage(fb)
+        http_client.configure(pool_maxsize=self._config.get("http_pool_maxsize"))
 
         self._build_ui()
-        self._check_system()
 
+        self._watcher = StpluginWatcher(
+            lambda diff: self.after(0, lambda: self._apply_library_diff(diff)))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Kritik olmayan isler ilk cizimden sonra: after_idle icinde kurulan timer,
+        # Tk'nin bekleyen cizim (idle) islerinden sonra calisir
+        self._startup_ms["window"] = (time.perf_counter() - self._t_start) * 1000
+        self.after_idle(lambda: self.after(0, self._after_first_paint))
+
+    def _after_first_paint(self):
+        self._startup_ms["interactive"] = (time.perf_counter() - self._t_start) * 1000
+        # Agir servisler Tk thread'inde kurulur; arka plan thread'leri hep hazir nesne gorur
+        for name in self._SERVICES:
+            getattr(self, name)
+        self._startup_ms["services"] = (time.perf_counter() - self._t_start) * 1000
+        ms = self._startup_ms
+        print(f"⏱️ Startup: window built in {ms['window']:.0f} ms, "
+              f"interactive in {ms['interactive']:.0f} ms, "
+              f"services ready in {ms['services']:.0f} ms")
+
+        http_client.prewarm()
+        self._check_system()
+        # Tum kutuphanenin DRM durumu arkada (hiz sinirli) tazelenir; kategoriler sayfa acilmadan hazir
+        self._sched.submit(lambda: self._drm.refresh_many(
+            g["app_id"] for g in list_added_games()), priority=PRIORITY_PREFETCH)
+        self._watcher.start()
+        self._denuvo.refresh_async(
+            on_done=lambda changed: changed and self.after(0, self._apply_denuvo))
         if self._config.get("auto_check_updates", True):
             threading.Thread(target=self._check_update_on_start, daemon=True).start()
 
+    # ─────────────────────────────────────────────────────────────────────────
+    # LAZY SERVICES
+    # ─────────────────────────────────────────────────────────────────────────
+    # cached_property kilitsizdir: worker thread'lerinin eristigi her servis burada olmali
+    _SERVICES = ("_meta", "_thumbs", "_sched", "_names", "_drm", "_denuvo", "_search")
+
+    def _built(self, name: str):
+        """Kurulmus servisi dondurur; hic kurulmadiysa None (kapatirken kurmamak icin)."""
+        return self.__dict__.get(name)
+
+    @cached_property
+    def _meta(self) -> MetadataStore:
+        return MetadataStore(os.path.join(get_app_data_dir(), "metadata.db"))
+
+    @cached_property
+    def _thumbs(self) -> ThumbnailCache:
+        return ThumbnailCache(os.path.join(get_app_data_dir(), "thumbnails"), (IMG_W, IMG_H))
+
+    @cached_property
+    def _sched(self) -> FetchScheduler:
+        return FetchScheduler()
+
+    @cached_property
+    def _names(self) -> "NameResolver":
+        return NameResolver(store=self._meta, executor=self._sched)
+
+    @property
+    def _name_cache(self) -> dict[str,str]:
+        return self._names.cache
+
+    @cached_property
+    def _drm(self) -> DrmStatusService:
+        # DRM durumlari (bulunamayanlar dahil) diskten gelir; kategoriler ilk cizimde dogru
+        return DrmStatusService(self._meta, names=self._name_cache,
+                                on_update=lambda a, st: self.after(0, self._on_drm_status, a, st))
+
+    @cached_property
+    def _denuvo(self):
+        return get_denuvo_set()
+
+    @cached_property
+    def _search(self) -> "StoreSearch":
+        return StoreSearch(executor=self._sched, submit_opts={"priority": PRIORITY_USER})
+
+    @property
+    def _empty_img(self):
+        """Kapaksiz kartlar icin placeholder; ilk kart cizilirken olusturulur."""
+        if self._empty_photo is None:
+            from PIL import ImageTk  # type: ignore
+            fb = _solid_placeholder(IMG_W, IMG_H, self.c_card_hi, "NO IMG", self.c_text_dim)
+            self._empty_photo = ImageTk.PhotoImage(fb)
+        return self._empty_photo
+
     # ─────────────────────────────────────────────────────────────────────────
     # CONFIG
     # ─────────────────────────────────────────────────────────────────────────
@@ -156,6 +281,8 @@ class GameInSteamApp(ctk.CTk):
             "auto_download_updates": False,
             "discord_webhook_enabled": True,
             "discord_webhook_url": DEFAULT_WEBHOOK_URL,
+            "http_pool_maxsize": http_client.DEFAULT_POOL_MAXSIZE,
+            "full_cache_wipe": False,
         }
         try:
             if os.path.exists(CONFIG_FILE):
@@ -319,19 +446,28 @@ class GameInSteamApp(ctk.CTk):
         self.main_frame = ctk.CTkFrame(self, corner_radius=0, fg_color=self.c_bg)
         self.main_frame.pack(side="right", fill="both", expand=True)
 
-        self.page_dash      = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        self.page_lib       = self._scroll_frame(self.main_frame)
-        self.page_recent    = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        self.page_available = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        self.page_settings  = self._scroll_frame(self.main_frame)
-
-        self._build_dash()
-        self._build_lib()
-        self._build_recent()
-        self._build_available()
-        self._build_settings()
+        # page_id -> (kaydirilabilir mi, kurucu); frame self.page_<id> olarak atanir
+        self._page_specs = {
+            "dash":      (False, self._build_dash),
+            "lib":       (True,  self._build_lib),
+            "recent":    (False, self._build_recent),
+            "available": (False, self._build_available),
+            "settings":  (True,  self._build_settings),
+        }
         self._show_dash()
 
+    def _page(self, page_id: str):
+        """Sayfayi ilk istendiginde kurar; sonraki cagrilarda ayni frame'i dondurur."""
+        page = self._pages.get(page_id)
+        if page is None:
+            scroll, build = self._page_specs[page_id]
+            page = (self._scroll_frame(self.main_frame) if scroll else
+                    ctk.CTkFrame(self.main_frame, fg_color="transparent"))
+            setattr(self, f"page_{page_id}", page)
+            self._pages[page_id] = page
+            build()
+        return page
+
     # ── NAV HELPERS ───────────────────────────────────────────────────────────
     def _sep(self, parent, side="top"):
         ctk.CTkFrame(parent, height=1, fg_color=self.c_sep).pack(
@@ -365,8 +501,7 @@ class GameInSteamApp(ctk.CTk):
             row._nav_btn.configure(
                 fg_color="transparent", text_color=self.c_text,
                 font=self._font(13))
-        for p in [self.page_dash, self.page_lib, self.page_recent,
-                  self.page_available, self.page_settings]:
+        for p in self._pages.values():
             p.pack_forget()
 
     def _activate_nav(self, row: ctk.CTkFrame):
@@ -375,32 +510,49 @@ class GameInSteamApp(ctk.CTk):
             fg_color=self.c_nav_sel, text_color=self.c_text,
             font=self._font(13, "bold"))
 
-    def _open_page(self, page, btn, page_id: str, on_show=None):
+    def _open_page(self, page_id: str, btn, on_show=None):
         """Hizli sayfa gecisi — basliklar ve layout ayni kalir."""
+        page = self._page(page_id)
         self._reset_nav()
         self._activate_nav(btn)
         page.pack(fill="both", expand=True, padx=40, pady=28)
+        sched = self._built("_sched")   # ilk cizimde scheduler henuz yok; bekleyen is de yok
+        if sched is not None:
+            if self._current_page and self._current_page != page_id:
+                sched.suspend_group(self._current_page)
+            sched.resume_group(page_id)
         self._current_page = page_id
         self.update_idletasks()
         if on_show:
             on_show()
 
     def _show_dash(self):
-        self._open_page(self.page_dash, self.btn_dash, "dash", self._refresh_hero_stats)
+        self._open_page("dash", self.btn_dash, self._refresh_hero_stats)
 
     def _show_lib(self):
-        self._open_page(self.page_lib, self.btn_lib, "lib", self._load_games)
+        self._open_page("lib", self.btn_lib,
+                        None if self._lib_loaded else self._load_games)
 
     def _show_recent(self):
-        self._open_page(self.page_recent, self.btn_recent, "recent", self._load_recent)
+        self._open_page("recent", self.btn_recent,
+                        None if self._recent_loaded else self._load_recent)
 
     def _show_available(self):
-        self._open_page(self.page_available, self.btn_available, "available")
+        self._open_page("available", self.btn_available)
         if not self._available_loaded:
             self._load_available_games()
 
     def _show_settings(self):
-        self._open_page(self.page_settings, self.btn_settings, "settings")
+        self._open_page("settings", self.btn_settings, self._refresh_cache_stats)
+
+    def _refresh_cache_stats(self):
+        st = self._thumbs.stats()
+        count, size = self._thumbs.disk_usage()
+        self.cache_stats_lbl.configure(
+            text=f"{count} thumbnails on disk ({size/1048576:.1f} MB)\n"
+                 f"This session: {st['hit_rate']*100:.0f}% hit rate "
+                 f"({st['hits']} hits / {st['misses']} misses), "
+                 f"{st['bytes_saved']/1048576:.1f} MB not downloaded")
 
     # ─────────────────────────────────────────────────────────────────────────
     # CARD & SECTION HELPERS
@@ -567,7 +719,7 @@ class GameInSteamApp(ctk.CTk):
                 stplugin_ok = os.path.isdir(get_stplugin_dir())
             except Exception:
                 stplugin_ok = False
-            lib_count  = len(list_added_games()) if stplugin_ok else 0
+            lib_count  = count_added_games() if stplugin_ok else 0
             repo_count = len(self._available_games)
             if hasattr(self, "hero_lib_val"):
                 self.hero_lib_val.configure(text=str(lib_count))
@@ -579,41 +731,31 @@ class GameInSteamApp(ctk.CTk):
     # ── SEARCH ────────────────────────────────────────────────────────────────
     def _on_search_change(self, *args):
         q = self.search_var.get().strip()
-        if len(q) < 3:
-            self.search_results_frame.pack_forget(); return
         if hasattr(self, "_st"):
             self.after_cancel(self._st)
-        self._st = self.after(300, lambda: self._start_search(q))
+        if len(q) < 3:
+            self._search.cancel()
+            self.search_results_frame.pack_forget(); return
+        # Onbellekteki sorgular beklemeden gosterilir
+        self._st = self.after(0 if self._search.has(q) else 300, lambda: self._start_search(q))
 
     def _start_search(self, query):
-        for w in self.search_results_frame.winfo_children(): w.destroy()
-        self.search_results_frame.pack(fill="x", pady=(4,0))
-        ctk.CTkLabel(self.search_results_frame, text="Searching…",
-                     font=ctk.CTkFont(size=12, slant="italic"),
-                     text_color=self.c_text_dim).pack(pady=8)
-        threading.Thread(target=self._do_steam_search, args=(query,), daemon=True).start()
-
-    def _do_steam_search(self, query):
-        try:
-            r = requests.get(
-                f"https://store.steampowered.com/api/storesearch/?term={query}&l=english&cc=US",
-                timeout=5)
-            items = r.json().get("items", [])[:6]
-            if items:
-                try:
-                    cr = requests.get(
-                        "https://store.steampowered.com/curator/26095454-Denuvo-Games/"
-                        "ajaxgetfilteredrecommendations/render/?start=0&count=1000", timeout=5)
-                    html = cr.json().get("results_html", "")
-                    for item in items:
-                        item["has_denuvo"] = str(item.get("id")) in html
-                except Exception:
-                    pass
-            self.after(0, self._render_search, items)
-        except Exception:
-            self.after(0, lambda: self._render_search([], error=True))
+        if not self.search_results_frame.winfo_ismapped():
+            for w in self.search_results_frame.winfo_children(): w.destroy()
+            self.search_results_frame.pack(fill="x", pady=(4,0))
+            ctk.CTkLabel(self.search_results_frame, text="Searching…",
+                         font=ctk.CTkFont(size=12, slant="italic"),
+                         text_color=self.c_text_dim).pack(pady=8)
+        self._search.search(query, self._on_search_result)
+
+    def _on_search_result(self, gen, query, items, final):
+        def _show():
+            if gen != self._search.generation: return   # daha yeni bir arama var
+            self._render_search(items or [], error=items is None)
+        self.after(0, _show)
 
     def _render_search(self, items, error=False):
+        self._search_items = items
         for w in self.search_results_frame.winfo_children(): w.destroy()
         if error:
             ctk.CTkLabel(self.search_results_frame, text="Search failed.",
@@ -624,7 +766,7 @@ class GameInSteamApp(ctk.CTk):
         for item in items:
             aid  = str(item.get("id",""))
             name = item.get("name","Unknown")
-            den  = item.get("has_denuvo", False)
+            den  = aid in self._denuvo
             txt  = f"⚠️  DENUVO: {name} [{aid}]" if den else f"{name}  [{aid}]"
             ctk.CTkButton(
                 self.search_results_frame, text=txt, anchor="w",
@@ -674,30 +816,48 @@ class GameInSteamApp(ctk.CTk):
                     textvariable=self.lib_search_var
                     ).pack(side="left", fill="x", expand=True, padx=(0, 12))
 
-        self._toolbar_btn(top, "Refresh", self._load_games).pack(side="right")
+        self._toolbar_btn(top, "Refresh", self._refresh_library).pack(side="right")
 
         self.lib_container = ctk.CTkFrame(self.page_lib, fg_color="transparent")
         self.lib_container.pack(fill="both", expand=True)
 
     def _filter_library(self, *args):
-        q   = self.lib_search_var.get().strip().lower()
         cat = self.cat_var.get()
-        for card in self.lib_container.winfo_children():
-            if not hasattr(card,"_app_id"): continue
-            aid  = card._app_id
-            name = self._name_cache.get(aid,"").lower()
-            st   = self._crack_cache.get(aid,{})
-            cr   = bool(st.get("cracked",False))
-            mc   = True
-            if cat == "Cracked":          mc = cr
-            elif cat == "Protected":      mc = not cr and st.get("protection") != "Unknown"
-            elif cat == "Clean / No DRM": mc = st.get("protection") == "Unknown"
-            show = (q in name or q in aid) and mc
-            if show: card.pack(fill="x", pady=6)
-            else:    card.pack_forget()
+        ids = self._lib_search.query(self.lib_search_var.get(), None if cat == "All" else cat)
+        show = set(ids)
+        # Sadece gorunurlugu degisen kartlara dokunulur
+        for aid in self._lib_visible - show:
+            card = self._lib_cards.get(aid)
+            if card is not None and card.winfo_exists(): card.pack_forget()
+        prev = None
+        for aid in ids:
+            card = self._lib_cards.get(aid)
+            if card is None: continue
+            if aid not in self._lib_visible:
+                if prev is not None:
+                    card.pack(fill="x", pady=6, after=prev)
+                else:
+                    first = self.lib_container.pack_slaves()
+                    card.pack(fill="x", pady=6, **({"before": first[0]} if first else {}))
+            prev = card
+        self._lib_visible = show
+
+    def _index_library(self, games):
+        self._lib_search.reset([g["app_id"] for g in games], self._name_cache)
+        self._lib_search.set_categories_many(
+            {g["app_id"]: _drm_categories(self._drm.get(g["app_id"])) for g in games})
+
+    def _refresh_library(self):
+        invalidate_steam_env()
+        self._names.clear_misses()
+        self._load_games()
 
     def _load_games(self):
+        self._sched.cancel_group("lib")
         for w in self.lib_container.winfo_children(): w.destroy()
+        self._lib_cards  = {}
+        self._lib_visible = set()
+        self._lib_loaded = True
         try:
             games = list_added_games()
             cnt   = len(games)
@@ -709,14 +869,20 @@ class GameInSteamApp(ctk.CTk):
                              font=ctk.CTkFont(size=14)).pack()
                 return
             for g in games: self._game_card(g)
+            self._fetch_lib_names(g["app_id"] for g in games)
+            self._drm.refresh_many(g["app_id"] for g in games)
+            self._lib_visible = set(self._lib_cards)
+            self._index_library(games)
+            self._filter_library()
         except Exception as e:
             print("Library err:", e)
 
-    def _game_card(self, g):
+    def _game_card(self, g, before=None):
         aid  = g["app_id"]
         card = self._card(self.lib_container)
         card._app_id = aid
-        card.pack(fill="x", pady=6)
+        card.pack(fill="x", pady=6, **({"before": before} if before else {}))
+        self._lib_cards[aid] = card
 
         row = ctk.CTkFrame(card, fg_color="transparent")
         row.pack(fill="x", padx=16, pady=14)
@@ -732,6 +898,7 @@ class GameInSteamApp(ctk.CTk):
                                  font=self._font(17, "bold"),
                                  text_color=self.c_text)
         name_lbl.pack(anchor="w")
+        card._name_lbl = name_lbl   # isim _fetch_lib_names ile toplu cozulur
 
         badge_row = ctk.CTkFrame(info, fg_color="transparent")
         badge_row.pack(anchor="w", pady=(4,0))
@@ -743,6 +910,9 @@ class GameInSteamApp(ctk.CTk):
                                    fg_color=self.c_card_hi,
                                    corner_radius=8, padx=8, pady=1)
         status_lbl.pack(side="left", padx=10)
+        card._status_lbl = status_lbl
+        card._denuvo_lbl = self._denuvo_badge(badge_row)
+        if aid in self._denuvo: card._denuvo_lbl.pack(side="left")
 
         btns = ctk.CTkFrame(row, fg_color="transparent")
         btns.pack(side="right")
@@ -753,65 +923,117 @@ class GameInSteamApp(ctk.CTk):
                       font=self._font(12),
                       command=lambda: self._do_remove(aid, card)).pack(side="left", padx=4)
 
-        if not cached:
-            threading.Thread(target=self._fetch_name, args=(aid,name_lbl), daemon=True).start()
-        if aid not in self._img_cache:
-            threading.Thread(target=self._fetch_img, args=(aid,img_lbl), daemon=True).start()
+        prio = PRIORITY_VISIBLE if len(self._lib_cards) <= VISIBLE_CARDS else PRIORITY_PREFETCH
+        photo = self._cached_photo(aid)
+        if photo is None:
+            self._sched.submit(self._fetch_img, aid, img_lbl, priority=prio, group="lib")
         else:
-            img_lbl.configure(image=self._img_cache[aid])
-        threading.Thread(target=self._fetch_crack,
-                         args=(aid,cached,status_lbl), daemon=True).start()
+            self._set_photo(img_lbl, photo)
+        if self._drm.get(aid) is not None:
+            self._apply_crack_ui(status_lbl, self._drm.get(aid))
+        if prio == PRIORITY_VISIBLE:   # gorunur kartlar kuyrugun onune; gerisi refresh_many ile
+            self._drm.request(aid, urgent=True)
+        return card
+
+    def _fetch_lib_names(self, aids):
+        """Kutuphanede ismi bilinmeyenler tek toplu istekle (resolve_many) cozulur."""
+        def done(a, name):
+            if name: self.after(0, lambda: self._show_lib_name(a, name))
+        self._names.resolve_many([a for a in aids if a not in self._name_cache], done)
+
+    def _show_lib_name(self, aid, name: str):
+        self._index_name(aid, name)
+        card = self._lib_cards.get(aid)
+        if card is not None and card.winfo_exists(): card._name_lbl.configure(text=name)
 
     def _fetch_name(self, aid, lbl):
-        name = get_game_name_from_steam(aid)
-        if name:
-            self._name_cache[aid] = name
-            self.after(0, lambda: lbl.configure(text=name) if lbl.winfo_exists() else None)
+        def done(a, name):
+            if name:
+                self.after(0, lambda: (self._index_name(a, name),
+                                       lbl.configure(text=name) if lbl.winfo_exists() else None))
+        self._names.resolve_async(aid, done)
+
+    def _index_name(self, aid, name: str):
+        self._lib_search.set_name(aid, name)
+        self._avail_search.set_name(aid, name)
+        self._drm.name_resolved(aid)   # sadece isimsiz aranip bulunamayanlari yeniden sorar
 
     def _fetch_img(self, aid, lbl, cache_key: str|None = None):
         key = cache_key or aid
+        path, stale = self._thumbs.get(aid)
+        if path:
+            self.after(0, lambda p=path: self._show_img(key, p, lbl))
+            if not stale: return
         try:
-            r = requests.get(HEADER_URL.format(aid), timeout=6)
+            r = http_client.get(HEADER_URL.format(aid), timeout=6)
             if r.status_code == 200:
-                img   = Image.open(io.BytesIO(r.content)).resize((IMG_W,IMG_H), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                self._img_cache[key] = photo
-                self.after(0, lambda: lbl.configure(image=photo) if lbl.winfo_exists() else None)
+                path = self._thumbs.put(aid, r.content)
+                if path: self.after(0, lambda p=path: self._show_img(key, p, lbl))
         except Exception:
             pass
 
-    def _fetch_crack(self, aid, name, lbl):
-        if aid in self._crack_cache:
-            self.after(0, lambda: self._apply_crack_ui(lbl, self._crack_cache[aid])); return
+    def _show_img(self, key, path: str, lbl):
+        """Onceden boyutlandirilmis PPM'i Tk'ye dogrudan yukler (PIL yok, resample yok)."""
         try:
-            h = {"User-Agent":"Mozilla/5.0"}
-            r = requests.get(f"https://gamestatus.info/back/api/gameinfo/game/?search={aid}",
-                             headers=h, timeout=10)
-            res  = r.json().get("results",[])
-            data = next((x for x in res if str(x.get("steam_prod_id"))==str(aid)), None)
-            if not data and name:
-                r2  = requests.get(f"https://gamestatus.info/back/api/gameinfo/game/?search={name}",
-                                   headers=h, timeout=10)
-                res2 = r2.json().get("results",[])
-                data = next((x for x in res2 if x.get("title","").lower()==name.lower()), None)
-            if data:
-                st = {"cracked":bool(data.get("crack_date")),
-                      "protection":data.get("protections","Unknown"),
-                      "date":data.get("crack_date") or "Uncracked"}
-                self._crack_cache[aid] = st
-                self.after(0, lambda: self._apply_crack_ui(lbl,st) if lbl.winfo_exists() else None)
-            else:
-                self.after(0, lambda: lbl.configure(
-                    text="CLEAN / NO DRM", fg_color=self.c_badge_clean,
-                    text_color=self.c_success) if lbl.winfo_exists() else None)
+            photo = tk.PhotoImage(file=path)
         except Exception:
-            self.after(0, lambda: lbl.configure(
-                text="ERROR", fg_color=self.c_badge_err,
-                text_color=self.c_danger) if lbl.winfo_exists() else None)
+            return
+        self._img_cache[key] = photo
+        self._img_cache.move_to_end(key)
+        while len(self._img_cache) > IMG_CACHE_SIZE:
+            self._img_cache.popitem(last=False)
+        # Sanal listede label baska bir oyuna gecmis olabilir
+        if getattr(lbl, "_app_id", key) != key: return
+        if lbl.winfo_exists(): self._set_photo(lbl, photo)
+
+    def _cached_photo(self, key):
+        """LRU'daki PhotoImage (yoksa None); isabet en yeni konuma tasinir."""
+        photo = self._img_cache.get(key)
+        if photo is not None:
+            self._img_cache.move_to_end(key)
+        return photo
+
+    def _set_photo(self, lbl, photo):
+        # Label kendi referansini tutar: LRU'dan dusen resim, gosterildigi kartta silinmez
+        lbl._photo = photo
+        lbl.configure(image=photo)
+
+    def _on_drm_status(self, aid, st):
+        """DrmStatusService'ten gelen sonuc (Tk thread'inde)."""
+        if st is not None:
+            self._lib_search.set_categories(aid, _drm_categories(st))
+            if self._lib_loaded and self.cat_var.get() != "All": self._filter_library()
+        card = self._lib_cards.get(aid)
+        if card is None or not card.winfo_exists(): return
+        if st is None:
+            card._status_lbl.configure(text="ERROR", fg_color=self.c_badge_err,
+                                       text_color=self.c_danger)
+        else:
+            self._apply_crack_ui(card._status_lbl, st)
+
+    def _denuvo_badge(self, parent) -> ctk.CTkLabel:
+        """Denuvo kuratorundeki oyunlar icin rozet (paketlenmeden doner)."""
+        return ctk.CTkLabel(parent, text="DENUVO",
+                            font=ctk.CTkFont(size=10, weight="bold"),
+                            fg_color=self.c_badge_err, text_color=self.c_danger,
+                            corner_radius=8, padx=8, pady=1)
+
+    def _apply_denuvo(self):
+        """Denuvo listesi tazelenince mevcut kartlardaki rozetleri gunceller."""
+        for aid, card in self._lib_cards.items():
+            if not card.winfo_exists(): continue
+            if aid in self._denuvo: card._denuvo_lbl.pack(side="left")
+            else:                   card._denuvo_lbl.pack_forget()
+        if self._available_loaded: self.avail_list.refresh()
+        if self._search_items and self.search_results_frame.winfo_ismapped():
+            self._render_search(self._search_items)
 
     def _apply_crack_ui(self, lbl, st):
         if not lbl.winfo_exists(): return
-        if st["cracked"]:
+        if st.get("found") is False:
+            lbl.configure(text="CLEAN / NO DRM", fg_color=self.c_badge_clean,
+                          text_color=self.c_success)
+        elif st["cracked"]:
             lbl.configure(text=f"✓ CRACKED  {st['date']}",
                           fg_color=self.c_badge_ok, text_color=self.c_success)
         else:
@@ -834,9 +1056,11 @@ class GameInSteamApp(ctk.CTk):
 
     def _load_recent(self):
         for w in self.recent_scroll.winfo_children(): w.destroy()
+        self._sched.cancel_group("recent")
+        self._recent_cards  = {}
+        self._recent_loaded = True
         self.recent_info.configure(text="Loading…")
-        threading.Thread(target=lambda: self.after(
-            0, lambda: self._render_recent(list_recent_games(30))), daemon=True).start()
+        self.after(0, lambda: self._render_recent(list_recent_games(RECENT_LIMIT)))
 
     def _render_recent(self, games):
         if not games:
@@ -848,58 +1072,114 @@ class GameInSteamApp(ctk.CTk):
 
         self.recent_info.configure(text=f"Showing {len(games)} most recently added games")
         for g in games:
-            aid   = g["app_id"]
-            mtime = g.get("mtime", 0)
-            card  = self._card(self.recent_scroll)
-            card.pack(fill="x", pady=5)
-
-            row = ctk.CTkFrame(card, fg_color="transparent")
-            row.pack(side="left", fill="both", expand=True, padx=12, pady=12)
-
-            img_lbl = tk.Label(row, bg=self.c_fill, image=self._empty_img, bd=0)
-            img_lbl.pack(side="left", padx=(0,14))
-
-            info = ctk.CTkFrame(row, fg_color="transparent")
-            info.pack(side="left", fill="x", expand=True)
-
-            name_lbl = ctk.CTkLabel(info,
-                                     text=self._name_cache.get(aid, f"AppID: {aid}"),
-                                     font=ctk.CTkFont("Segoe UI",16,weight="bold"),
-                                     text_color=self.c_text)
-            name_lbl.pack(anchor="w")
-
-            meta = ctk.CTkFrame(info, fg_color="transparent")
-            meta.pack(anchor="w", pady=(3,0))
-            ctk.CTkLabel(meta, text=f"ID: {aid}",
-                         font=ctk.CTkFont(size=11),
-                         text_color=self.c_text_dim).pack(side="left")
-            ctk.CTkLabel(meta, text=f"  •  Added {_time_ago(mtime)}",
-                         font=ctk.CTkFont(size=11),
-                         text_color=self.c_accent2).pack(side="left")
-
-            right = ctk.CTkFrame(row, fg_color="transparent")
-            right.pack(side="right")
-            ctk.CTkButton(right, text="Remove", width=86, height=30,
-                          fg_color=self.c_fill, text_color=self.c_danger,
-                          hover_color=self.c_danger_hov, corner_radius=self.r_md,
-                          font=self._font(12),
-                          command=lambda a=aid, c=card: self._do_remove(a, c)).pack()
-
-            if aid not in self._name_cache:
-                threading.Thread(target=self._fetch_name,
-                                 args=(aid,name_lbl), daemon=True).start()
-            if aid not in self._img_cache:
-                threading.Thread(target=self._fetch_img,
-                                 args=(aid,img_lbl), daemon=True).start()
-            else:
-                img_lbl.configure(image=self._img_cache[aid])
+            self._recent_card(g)
+
+    def _recent_card(self, g, before=None):
+        aid   = g["app_id"]
+        mtime = g.get("mtime", 0)
+        card  = self._card(self.recent_scroll)
+        card._app_id = aid
+        card.pack(fill="x", pady=5, **({"before": before} if before else {}))
+        self._recent_cards[aid] = card
+
+        row = ctk.CTkFrame(card, fg_color="transparent")
+        row.pack(side="left", fill="both", expand=True, padx=12, pady=12)
+
+        img_lbl = tk.Label(row, bg=self.c_fill, image=self._empty_img, bd=0)
+        img_lbl.pack(side="left", padx=(0,14))
+
+        info = ctk.CTkFrame(row, fg_color="transparent")
+        info.pack(side="left", fill="x", expand=True)
+
+        name_lbl = ctk.CTkLabel(info,
+                                 text=self._name_cache.get(aid, f"AppID: {aid}"),
+                                 font=ctk.CTkFont("Segoe UI",16,weight="bold"),
+                                 text_color=self.c_text)
+        name_lbl.pack(anchor="w")
+
+        meta = ctk.CTkFrame(info, fg_color="transparent")
+        meta.pack(anchor="w", pady=(3,0))
+        ctk.CTkLabel(meta, text=f"ID: {aid}",
+                     font=ctk.CTkFont(size=11),
+                     text_color=self.c_text_dim).pack(side="left")
+        ctk.CTkLabel(meta, text=f"  •  Added {_time_ago(mtime)}",
+                     font=ctk.CTkFont(size=11),
+                     text_color=self.c_accent2).pack(side="left")
+
+        right = ctk.CTkFrame(row, fg_color="transparent")
+        right.pack(side="right")
+        ctk.CTkButton(right, text="Remove", width=86, height=30,
+                      fg_color=self.c_fill, text_color=self.c_danger,
+                      hover_color=self.c_danger_hov, corner_radius=self.r_md,
+                      font=self._font(12),
+                      command=lambda a=aid, c=card: self._do_remove(a, c)).pack()
+
+        if aid not in self._name_cache:
+            self._fetch_name(aid, name_lbl)
+        photo = self._cached_photo(aid)
+        if photo is None:
+            self._sched.submit(self._fetch_img, aid, img_lbl, group="recent")
+        else:
+            self._set_photo(img_lbl, photo)
+        return card
+
+    # ── LIVE UPDATES (stplug-in watcher) ──────────────────────────────────────
+    def _apply_library_diff(self, diff):
+        """Watcher'dan gelen added/removed/modified listesini sadece etkilenen kartlara uygular."""
+        self._refresh_hero_stats()
+        self._drm.refresh_many(diff["added"])
+        if self._lib_loaded:
+            self._apply_lib_diff(diff)
+        if self._recent_loaded:
+            self._apply_recent_diff(diff)
+
+    def _apply_lib_diff(self, diff):
+        for aid in diff["removed"]:
+            card = self._lib_cards.pop(aid, None)
+            if card is not None and card.winfo_exists(): card.destroy()
+        games = list_added_games()
+        if not games or (diff["added"] and not self._lib_cards):
+            self._load_games(); return   # bos-kutuphane etiketi <-> kartlar
+        self.lib_count.configure(text=f"{len(games)} game{'s' if len(games)!=1 else ''}")
+        nxt, added = None, []
+        for g in reversed(games):
+            card = self._lib_cards.get(g["app_id"])
+            if card is None:
+                card = self._game_card(g, before=nxt)
+                added.append(g["app_id"])
+            if card.winfo_manager() == "pack":
+                nxt = card
+        self._fetch_lib_names(added)
+        self._lib_visible = {a for a, c in self._lib_cards.items() if c.winfo_manager() == "pack"}
+        self._index_library(games)
+        self._filter_library()   # yeni kartlar da mevcut filtreye uysun
+
+    def _apply_recent_diff(self, diff):
+        games = list_recent_games(RECENT_LIMIT)
+        keep  = {g["app_id"] for g in games}
+        stale = set(diff["removed"]) | set(diff["modified"])
+        for aid in list(self._recent_cards):
+            if aid not in keep or aid in stale:
+                card = self._recent_cards.pop(aid)
+                if card.winfo_exists(): card.destroy()
+        if not games or not self._recent_cards:
+            for w in self.recent_scroll.winfo_children(): w.destroy()
+            self._recent_cards = {}
+            self._render_recent(games); return
+        self.recent_info.configure(text=f"Showing {len(games)} most recently added games")
+        nxt = None
+        for g in reversed(games):
+            card = self._recent_cards.get(g["app_id"])
+            if card is None:
+                card = self._recent_card(g, before=nxt)
+            nxt = card
 
     # ─────────────────────────────────────────────────────────────────────────
     # AVAILABLE GAMES
     # ─────────────────────────────────────────────────────────────────────────
     def _build_available(self):
         self.avail_refresh_btn = self._page_header(
-            self.page_available, "Available Games", self._refresh_available_games)
+            self.page_available, "Available Games", self._load_available_games)
 
         # Search bar
         search_row = ctk.CTkFrame(self.page_available, fg_color="transparent")
@@ -922,99 +1202,134 @@ class GameInSteamApp(ctk.CTk):
         self._entry(search_row, "Filter by name or App ID…", height=28, width=260,
                     textvariable=self.avail_search_var).pack(side="right")
 
-        self.avail_scroll = self._scroll_frame(self.page_available)
-        self.avail_scroll.pack(fill="both", expand=True)
+        self.avail_msg_lbl = ctk.CTkLabel(
+            self.page_available, text="Could not load game list. Check internet.",
+            text_color=self.c_danger, pady=40)
+        # Sadece ekrandaki satirlar (+ overscan) olusturulur, kaydirinca yeniden kullanilir
+        self.avail_list = VirtualList(
+            self.page_available, AVAIL_ROW_H, self._avail_row, self._bind_avail_row,
+            bg=self.c_bg, scrollbar_button_color=self.c_fill_hover,
+            scrollbar_button_hover_color=self.c_text_tert)
+        self.avail_list.pack(fill="both", expand=True)
 
     def _load_available_games(self):
-        self.avail_count_lbl.configure(text="Fetching from repo…")
+        self._available_loaded = True
         self.avail_refresh_btn.configure(state="disabled", text="Loading…")
-        for w in self.avail_scroll.winfo_children(): w.destroy()
+        self._sched.cancel_group("available")
         self._start_spin(self.avail_spin_lbl)
-        threading.Thread(target=self._worker_fetch_available, daemon=True).start()
-
-    def _refresh_available_games(self):
-        self._available_loaded = False
-        self._available_games  = []
-        self._load_available_games()
+        # Diskteki son liste aninda cizilir, tazeleme arkada ETag ile yapilir
+        cached = get_cached_gamelist_games()
+        if cached:
+            self._render_available(cached)
+        else:
+            self.avail_count_lbl.configure(text="Fetching from repo…")
+            self.avail_msg_lbl.pack_forget()
+            self.avail_list.set_items([])
+        self._sched.submit(self._worker_fetch_available, priority=PRIORITY_USER)
 
     def _worker_fetch_available(self):
-        ids = get_gamelist_repo_games()
-        self.after(0, lambda: self._render_available(ids))
+        diff = sync_gamelist_manifest()
+        self.after(0, lambda: self._finish_available_sync(diff))
 
-    def _render_available(self, ids: list):
+    def _finish_available_sync(self, diff):
         self._stop_spin()
         self.avail_spin_lbl.configure(text="")
-        self._available_loaded = True
-        self._available_games  = ids
         self.avail_refresh_btn.configure(state="normal", text="↺  Refresh")
-        for w in self.avail_scroll.winfo_children(): w.destroy()
+        if diff is not None and not any(diff.values()) and self._available_games:
+            return   # 304 / degisiklik yok: mevcut liste aynen kalir
+        if diff is None and self._available_games:
+            return   # ag hatasi: diskteki liste gosterilmeye devam eder
+        self._render_available(get_cached_gamelist_games())
+
+    def _render_available(self, ids: list):
+        self._available_games = ids
 
         if not ids:
-            ctk.CTkLabel(self.avail_scroll,
-                         text="Could not load game list. Check internet.",
-                         text_color=self.c_danger, pady=40).pack()
+            self.avail_list.set_items([])
+            self.avail_msg_lbl.pack(before=self.avail_list)
             self.avail_count_lbl.configure(text="0 games found"); return
 
+        self.avail_msg_lbl.pack_forget()
+        self._avail_search.reset(ids, self._name_cache)
         self.avail_count_lbl.configure(text=f"{len(ids)} games available in repo")
         self._refresh_hero_stats()
-        for aid in ids:
-            self._available_card(aid)
+        self._filter_available()
 
-    def _available_card(self, aid: str):
-        card = self._card(self.avail_scroll)
-        card._app_id   = aid
-        card._name_str = ""
-        card.pack(fill="x", pady=5)
+    def _avail_row(self, parent) -> ctk.CTkFrame:
+        """Bos, yeniden kullanilabilir satir; icerigi _bind_avail_row doldurur."""
+        card = self._card(parent)
+        card._app_id  = None
+        card._img_fut = None
 
         row = ctk.CTkFrame(card, fg_color="transparent")
         row.pack(fill="both", expand=True, padx=16, pady=14)
 
-        img_lbl = tk.Label(row, bg=self.c_fill, image=self._empty_img, bd=0)
-        img_lbl.pack(side="left", padx=(0,14))
+        card._img_lbl = tk.Label(row, bg=self.c_fill, image=self._empty_img, bd=0)
+        card._img_lbl.pack(side="left", padx=(0,14))
 
         info = ctk.CTkFrame(row, fg_color="transparent")
         info.pack(side="left", fill="x", expand=True)
 
-        name_lbl = ctk.CTkLabel(info, text=f"AppID: {aid}",
-                                  font=ctk.CTkFont("Segoe UI",16,weight="bold"),
-                                  text_color=self.c_text)
-        name_lbl.pack(anchor="w")
-        ctk.CTkLabel(info, text=f"ID: {aid}",
-                     font=ctk.CTkFont(size=11),
-                     text_color=self.c_text_dim).pack(anchor="w")
-        ctk.CTkLabel(info, text="✓  in gamelist repo",
+        card._name_lbl = ctk.CTkLabel(info, text="",
+                                      font=ctk.CTkFont("Segoe UI",16,weight="bold"),
+                                      text_color=self.c_text)
+        card._name_lbl.pack(anchor="w")
+        card._id_lbl = ctk.CTkLabel(info, text="",
+                                    font=ctk.CTkFont(size=11),
+                                    text_color=self.c_text_dim)
+        card._id_lbl.pack(anchor="w")
+        badges = ctk.CTkFrame(info, fg_color="transparent")
+        badges.pack(anchor="w", pady=(5,0))
+        ctk.CTkLabel(badges, text="✓  in gamelist repo",
                      font=ctk.CTkFont(size=10, weight="bold"),
                      fg_color=self.c_accent_dim, text_color=self.c_accent,
-                     corner_radius=8, padx=8, pady=1).pack(anchor="w", pady=(5,0))
+                     corner_radius=8, padx=8, pady=1).pack(side="left")
+        card._denuvo_lbl = self._denuvo_badge(badges)
 
         right = ctk.CTkFrame(row, fg_color="transparent")
         right.pack(side="right")
-        self._primary_btn(right, "Add", lambda a=aid, nl=name_lbl: self._quick_add(a, nl),
+        self._primary_btn(right, "Add", lambda c=card: self._quick_add(c._app_id, c._name_lbl),
                           width=88, height=34).pack()
-
-        threading.Thread(target=self._fetch_avail_name,
-                         args=(aid,name_lbl,card), daemon=True).start()
-        if aid not in self._img_cache:
-            threading.Thread(target=self._fetch_img,
-                             args=(aid,img_lbl), daemon=True).start()
+        return card
+
+    def _bind_avail_row(self, card, idx: int, aid: str):
+        pending = card._img_fut is not None and not card._img_fut.done()
+        if card._app_id != aid:
+            # Satir baska bir oyuna geciyor: eski oyunun kuyruktaki resmi artik gereksiz
+            if pending: card._img_fut.cancel()
+            card._img_fut, pending = None, False
+        card._app_id = card._img_lbl._app_id = aid
+
+        name = self._name_cache.get(aid)
+        card._name_lbl.configure(text=name or f"AppID: {aid}")
+        card._id_lbl.configure(text=f"ID: {aid}")
+        if aid in self._denuvo:
+            card._denuvo_lbl.pack(side="left", padx=(8,0))
         else:
-            img_lbl.configure(image=self._img_cache[aid])
+            card._denuvo_lbl.pack_forget()
+        if not name:
+            self._fetch_avail_name(aid)
 
-    def _fetch_avail_name(self, aid, lbl, card):
-        name = self._name_cache.get(aid) or get_game_name_from_steam(aid)
-        if name:
-            self._name_cache[aid] = name
-            card._name_str        = name.lower()
-            self.after(0, lambda: lbl.configure(text=name) if lbl.winfo_exists() else None)
+        photo = self._cached_photo(aid)
+        if photo is not None:
+            self._set_photo(card._img_lbl, photo)
+        else:
+            self._set_photo(card._img_lbl, self._empty_img)
+            if not pending:
+                start, end = self.avail_list.visible_range()
+                prio = PRIORITY_VISIBLE if start <= idx < end else PRIORITY_PREFETCH
+                card._img_fut = self._sched.submit(self._fetch_img, aid, card._img_lbl,
+                                                   priority=prio, group="available")
+
+    def _fetch_avail_name(self, aid):
+        def done(a, name):
+            if name:
+                self.after(0, lambda: (self._index_name(a, name),
+                                       self.avail_list.refresh(lambda item: item == a)))
+        self._names.resolve_async(aid, done)
 
     def _filter_available(self, *args):
-        q = self.avail_search_var.get().strip().lower()
-        for card in self.avail_scroll.winfo_children():
-            if not hasattr(card,"_app_id"): continue
-            aid  = card._app_id
-            name = getattr(card,"_name_str","") or self._name_cache.get(aid,"").lower()
-            if q in aid or q in name: card.pack(fill="x", pady=5)
-            else: card.pack_forget()
+        self.avail_list.set_items(self._avail_search.query(self.avail_search_var.get()))
 
     def _quick_add(self, aid, name_lbl):
         name = self._name_cache.get(aid,"")
@@ -1062,6 +1377,31 @@ class GameInSteamApp(ctk.CTk):
             i1, text="", text_color=self.c_text_dim, font=self._font(12))
         self.update_status_label.pack(anchor="w", pady=(8, 0))
 
+        ctk.CTkLabel(self.page_settings, text="Storage",
+                     font=self._font(13, "bold"), text_color=self.c_text_tert
+                     ).pack(anchor="w", pady=(0, 8))
+
+        c3 = self._group_card(self.page_settings)
+        c3.pack(fill="x", pady=(0, 20))
+        i3 = ctk.CTkFrame(c3, fg_color="transparent")
+        i3.pack(padx=20, pady=18, fill="x")
+        ctk.CTkLabel(i3, text="Thumbnail Cache",
+                     font=self._font(15, "bold"), text_color=self.c_text
+                     ).pack(anchor="w", pady=(0, 6))
+        self.cache_stats_lbl = ctk.CTkLabel(
+            i3, text="", text_color=self.c_text_dim, font=self._font(12), justify="left")
+        self.cache_stats_lbl.pack(anchor="w")
+        ctk.CTkLabel(i3, text="Steam Cache",
+                     font=self._font(15, "bold"), text_color=self.c_text
+                     ).pack(anchor="w", pady=(16, 6))
+        self.sw_full_wipe = ctk.CTkSwitch(
+            i3, text="Wipe the whole appcache on restart (slower Steam startup)",
+            font=self._font(13), progress_color=self.c_accent,
+            command=self._save_settings)
+        if self._config.get("full_cache_wipe", False):
+            self.sw_full_wipe.select()
+        self.sw_full_wipe.pack(anchor="w", pady=6)
+
         ctk.CTkLabel(self.page_settings, text="Community",
                      font=self._font(13, "bold"), text_color=self.c_text_tert
                      ).pack(anchor="w", pady=(0, 8))
@@ -1089,6 +1429,7 @@ class GameInSteamApp(ctk.CTk):
         try:
             self._config["auto_check_updates"]    = bool(self.sw_auto_check.get()==1)
             self._config["auto_download_updates"] = bool(self.sw_auto_dl.get()==1)
+            self._config["full_cache_wipe"]       = bool(self.sw_full_wipe.get()==1)
             self._save_config()
         except Exception:
             pass
@@ -1119,20 +1460,32 @@ class GameInSteamApp(ctk.CTk):
         if not valid: return
         if not name: name = f"Game_{valid[0]}" if len(valid)==1 else f"{len(valid)} Games"
         self._set_busy(True, "🔍  Checking repo…")
-        threading.Thread(target=self._worker_repo_check,
-                         args=(valid, name), daemon=True).start()
-
-    def _worker_repo_check(self, valid_ids, name):
-        not_found = []
-        for aid in valid_ids:
-            if self._available_games:
-                if aid not in self._available_games: not_found.append(aid)
-            else:
-                if not is_game_in_repo(aid): not_found.append(aid)
-        if not_found:
-            self.after(0, lambda: self._handle_not_found(not_found, valid_ids, name))
-        else:
-            self.after(0, lambda: self._proceed_add(valid_ids, name))
+        # Listede olanlar ag olmadan kabul edilir; eksikler ancak liste tazeyse "yok" sayilir
+        missing = [a for a in valid if a not in self._avail_search]
+        if not missing or (self._available_games and gamelist_manifest_fresh()):
+            self._after_repo_check(valid, name, missing)
+            return
+        self._check_repo_many(missing, lambda not_found: self._after_repo_check(
+            valid, name, not_found))
+
+    def _check_repo_many(self, app_ids, on_done):
+        """Her AppID scheduler'da ayri kontrol edilir; hepsi bitince on_done(not_found) Tk'de cagrilir."""
+        futs  = {a: self._sched.submit(is_game_in_repo, a, priority=PRIORITY_USER) for a in app_ids}
+        left  = [len(futs)]
+        guard = threading.Lock()
+        def done(_f):
+            with guard:
+                left[0] -= 1
+                if left[0]: return
+            # Hata / iptal "var" sayilir: kullaniciyi engelleme
+            not_found = [a for a, f in futs.items()
+                         if not f.cancelled() and f.exception() is None and not f.result()]
+            self.after(0, lambda: on_done(not_found))
+        for f in futs.values(): f.add_done_callback(done)
+
+    def _after_repo_check(self, valid_ids, name, not_found):
+        if not_found: self._handle_not_found(not_found, valid_ids, name)
+        else:         self._proceed_add(valid_ids, name)
 
     def _handle_not_found(self, not_found, valid_ids, name):
         self._set_busy(False)
@@ -1160,18 +1513,23 @@ class GameInSteamApp(ctk.CTk):
                          args=(valid_ids, name), daemon=True).start()
 
     def _worker_add(self, app_ids, base_name):
-        results, total = [], len(app_ids)
-        for idx, aid in enumerate(app_ids):
-            try:
-                gname = base_name if total==1 else f"{base_name} ({idx+1}/{total})"
-                def cb(pct, m, i=idx):
-                    self.after(0, lambda p=pct, t=m: [
-                        self.prog_bar.set(p),
-                        self.status_lbl.configure(text=f"[{i+1}/{total}] {t}")])
-                ok, msg = add_shortcut_from_manifest(aid, gname, on_progress=cb)
-                results.append((aid, ok, msg))
-            except Exception as e:
-                results.append((aid, False, str(e)))
+        total = len(app_ids)
+        names = {aid: base_name if total==1 else f"{base_name} ({idx+1}/{total})"
+                 for idx, aid in enumerate(app_ids)}
+        done  = [0]
+        def on_prog(pct, m):
+            self.after(0, lambda p=pct, t=m: [
+                self.prog_bar.set(p), self.status_lbl.configure(text=t)])
+        def on_item(i, aid, ok, m):
+            done[0] += 1
+            mark = "✅" if ok else "❌"
+            self.after(0, lambda n=done[0]: self.status_lbl.configure(
+                text=f"[{n}/{total}] {mark}  AppID {aid}"))
+        try:
+            results = add_games_batch(app_ids, names=names,
+                                      on_item=on_item, on_progress=on_prog)
+        except Exception as e:
+            results = [(aid, False, str(e)) for aid in app_ids]
         self.after(0, lambda: self._done_add(results))
 
     def _done_add(self, results):
@@ -1213,23 +1571,27 @@ class GameInSteamApp(ctk.CTk):
             self.prog_bar.set(0); self.prog_bar.pack_forget()
 
     def _do_update(self, aid):
-        threading.Thread(target=lambda: self._wk_update(aid), daemon=True).start()
+        self._sched.submit(self._wk_update, aid, priority=PRIORITY_USER)
 
     def _wk_update(self, aid):
         ok, msg = update_game(aid)
         if ok:
-            gn = get_game_name_from_steam(aid) or f"Game_{aid}"
-            self.after(0, lambda: self._send_updated(aid, gn))
-        self.after(0, lambda: [self._load_games(), messagebox.showinfo("Info", msg)])
+            # Scheduler worker'inda: ayni havuza is atip beklemek yerine callback
+            self._names.resolve_async(aid, lambda a, name: self.after(
+                0, lambda: self._send_updated(a, name or f"Game_{a}")))
+        self.after(0, lambda: messagebox.showinfo("Info", msg))
 
     def _do_remove(self, aid, card):
         if messagebox.askyesno("Confirm", "Remove this game?"):
             ok, msg = remove_game(aid)
             if ok:
                 card.destroy()
+                for cards in (self._lib_cards, self._recent_cards):
+                    if cards.get(aid) is card: cards.pop(aid)
+                self._watcher.poll()   # diger sayfalardaki kart(lar) diff ile kalkar
                 try:
-                    gn = get_game_name_from_steam(aid) or f"Game_{aid}"
-                    self._send_removed(aid, gn)
+                    self._names.resolve_async(
+                        aid, lambda a, n: self._send_removed(a, n or f"Game_{a}"))
                 except Exception: pass
                 self._refresh_hero_stats()
             else:
@@ -1240,11 +1602,16 @@ class GameInSteamApp(ctk.CTk):
         threading.Thread(target=self._wk_restart, daemon=True).start()
 
     def _wk_restart(self):
-        ok = restart_steam()
+        phases = []
+        ok = restart_steam(on_phase=lambda name, took, done: phases.append((name, took, done)),
+                           full_cache_wipe=self._config.get("full_cache_wipe", False))
         if ok:
+            total  = sum(t for _, t, _ in phases)
+            detail = ", ".join(f"{n} {t:.1f}s" + ("" if d else " ⚠") for n, t, d in phases)
             self.after(0, lambda: [
-                self.status_lbl.configure(text="✅  Steam restarted!", text_color=self.c_success),
-                messagebox.showinfo("Success","Steam restarted!")])
+                self.status_lbl.configure(text=f"✅  Steam restarted in {total:.1f}s",
+                                          text_color=self.c_success),
+                messagebox.showinfo("Success", f"Steam restarted!\n\n{detail}")])
         else:
             self.after(0, lambda: [
                 self.status_lbl.configure(text="❌  Steam not found!", text_color=self.c_danger),
@@ -1254,20 +1621,25 @@ class GameInSteamApp(ctk.CTk):
     # UPDATES
     # ─────────────────────────────────────────────────────────────────────────
     def _check_update_on_start(self):
-        time.sleep(2)
+        # Onbellekteki release'ten (ya da tek kosullu istekle) cevaplanir — acilisi geciktirmez
         with self._update_lock:
             if self._update_checking or self._update_dialog_open: return
             self._update_checking = True
+        info = None
         try:
             info = check_for_update()
-            if info:
-                self._update_info = info
-                with self._update_lock:
-                    if not self._update_dialog_open:
-                        self.after(0, lambda: self._show_update_dlg(info))
         except Exception: pass
         finally:
             with self._update_lock: self._update_checking = False
+        if not info: return
+        self._update_info = info
+        if self._config.get("auto_download_updates", False):
+            # Hiz sinirli, dusuk oncelikli indirme; dialog installer hazir olunca acilir
+            self._update_staged = prefetch_update(info, stop=self._prefetch_stop)
+            if self._prefetch_stop.is_set(): return   # kapaniyor ya da kullanici indirmeyi baslatti
+        with self._update_lock:
+            if not self._update_dialog_open:
+                self.after(0, lambda: self._show_update_dlg(info))
 
     def _show_update_dlg(self, info):
         with self._update_lock:
@@ -1275,8 +1647,14 @@ class GameInSteamApp(ctk.CTk):
             self._update_dialog_open = True
         ver  = info.get("version","?")
         size = info.get("size",0)/(1024*1024)
+        staged = self._update_staged
         try:
-            if messagebox.askyesno("Update",
+            if staged:
+                if messagebox.askyesno("Update",
+                   f"v{ver} has been downloaded and verified.\n\n"
+                   f"Current: v{CURRENT_VERSION}\nNew: v{ver}\n\nInstall now?"):
+                    self._inst_update(staged)
+            elif messagebox.askyesno("Update",
                f"New version available!\n\nCurrent: v{CURRENT_VERSION}\nNew: v{ver}\n"
                f"Size: {size:.1f} MB\n\nDownload?"):
                 self._dl_update(info)
@@ -1294,7 +1672,7 @@ class GameInSteamApp(ctk.CTk):
             if self._update_checking or self._update_dialog_open: return
             self._update_checking = True
         try:
-            info = check_for_update()
+            info = check_for_update(force=True)
             if info:
                 self._update_info = info
                 with self._update_lock:
@@ -1336,22 +1714,27 @@ class GameInSteamApp(ctk.CTk):
     def _dl_update(self, info):
         url = info.get("download_url")
         if not url: return
+        self._page("settings")   # ilerleme etiketi ve buton Settings sayfasinda
         self.btn_check_update.configure(state="disabled", text="Downloading…")
         def prog(dl, tot):
             if tot>0:
                 self.after(0, lambda: self.update_status_label.configure(
                     text=f"Downloading: {dl/tot*100:.1f}% ({dl/1048576:.1f}/{tot/1048576:.1f} MB)",
                     text_color=self.c_accent))
+        self._prefetch_stop.set()   # suren on-indirme .part dosyasini bu indirmeye devreder
         def worker():
             try:
-                fp = download_update(url, prog)
+                fp = fetch_update(info, prog)   # hazir installer → delta → tam indirme
                 if fp: self.after(0, lambda: self._inst_update(fp))
-                else:  self.after(0, lambda: messagebox.showerror("Error","Download failed!"))
+                else:  self.after(0, lambda: messagebox.showerror(
+                    "Error", "Download failed or the file could not be verified!\n"
+                             "Retry to resume where it stopped."))
             except Exception as e:
                 self.after(0, lambda: messagebox.showerror("Error", str(e)))
         threading.Thread(target=worker, daemon=True).start()
 
     def _inst_update(self, fp):
+        self._page("settings")
         self.update_status_label.configure(text="Installing…")
         try: apply_update(fp)
         except Exception as e:
@@ -1371,9 +1754,9 @@ class GameInSteamApp(ctk.CTk):
         payload = {"embeds":[embed],"username":"GameInSteam",
                    "avatar_url":"https://cdn.akamai.steamstatic.com/steam/apps/730/header.jpg"}
         def post():
-            try: requests.post(url, json=payload, timeout=8)
+            try: http_client.post(url, json=payload, timeout=8)
             except Exception: pass
-        threading.Thread(target=post, daemon=True).start()
+        self._sched.submit(post, priority=PRIORITY_USER)
 
     def _send_added(self, aid, name, ok, tot):
         if tot==1: self._webhook("🎮 Game Added",f"**{name}**\nAppID: `{aid}`",
@@ -1389,14 +1772,31 @@ class GameInSteamApp(ctk.CTk):
                       0xF43F5E, HEADER_URL.format(aid))
 
 
+    def _on_close(self):
+        self._prefetch_stop.set()
+        self._watcher.stop()
+        for name, stop in (("_drm", "stop"), ("_sched", "shutdown"),
+                           ("_names", "shutdown"), ("_meta", "close")):
+            svc = self._built(name)
+            if svc is not None:
+                getattr(svc, stop)()
+        st = self._thumbs.stats()
+        print(f"🖼️ Thumbnail cache: {st['hit_rate']*100:.0f}% hit rate, "
+              f"{st['bytes_saved']:,} bytes saved")
+        self.destroy()
+
+
 # ──────────────────────────────────────────────────────────────────────────────
-def main():
+def main(started: float | None = None):
     try:
         from ctypes import windll  # type: ignore
         windll.shcore.SetProcessDpiAwareness(1)
     except Exception:
         pass
-    GameInSteamApp().mainloop()
+    try:
+        GameInSteamApp(started).mainloop()
+    finally:
+        http_client.close()
 
 
 if __name__ == "__main__":
@@ -4,16 +4,36 @@ Update check and download via GitHub Releases API.
 """
 
 import os
+import re
 import sys
+import json
+import hashlib
 import subprocess
 import tempfile
 import threading
 import time
-import requests
+from contextlib import contextmanager
+import http_client
+from steam_handler import get_app_data_dir, _atomic_write_json
 
 GITHUB_REPO = "kakies13/GameInSteam"
 GITHUB_API = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
 
+DOWNLOAD_CHUNK = 65536
+DOWNLOAD_RETRIES = 5          # consecutive failures without progress before giving up
+PROGRESS_INTERVAL = 0.15      # seconds between on_progress calls
+
+UPDATE_STATE_FILE = "update_state.json"   # last release payload + ETag
+MIN_RECHECK_INTERVAL = 6 * 3600           # seconds a cached release answer is trusted
+
+UPDATE_CACHE_SUBDIR = "updates"           # staged installers (under the app data dir)
+PREFETCH_MAX_RATE = 512 * 1024            # bytes/s for background pre-downloads
+
+_DELTA_RE = re.compile(r"_v?(\d+(?:\.\d+)*)_to_v?(\d+(?:\.\d+)*)\.delta$", re.I)
+_INSTALLER_VERSION_RE = re.compile(r"v(\d+(?:\.\d+)*)\.exe$", re.I)
+
+_download_lock = threading.Lock()         # one writer per .part file at a time
+
 # Read version number from VERSION.txt (fallback if missing)
 def _get_version():
     try:
@@ -81,108 +101,484 @@ def _compare_versions(v1: tuple, v2: tuple) -> int:
         return 0
 
 
-def check_for_update() -> dict | None:
+def _state_path() -> str:
+    return os.path.join(get_app_data_dir(), UPDATE_STATE_FILE)
+
+
+def _load_state() -> dict:
+    try:
+        with open(_state_path(), "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_state(state: dict):
+    try:
+        _atomic_write_json(_state_path(), state)
+    except OSError:
+        pass
+
+
+def _slim_release(data: dict) -> dict:
+    """The parts of a release payload the updater reads, plus the resolved SHA-256s."""
+    assets = [{k: a.get(k) for k in ("name", "browser_download_url", "size", "digest")}
+              for a in data.get("assets", [])]
+    release = {"tag_name": data.get("tag_name", ""), "body": data.get("body", ""),
+               "assets": assets}
+    # Resolve checksums once per release, not on every (cached) check
+    release["sha256"] = {a["name"]: _find_sha256(data, a["name"])
+                         for a in assets if (a.get("name") or "").lower().endswith(".exe")}
+    return release
+
+
+def _fetch_release(state: dict, force: bool) -> dict | None:
+    """
+    Latest release payload: the cached one while it is younger than
+    MIN_RECHECK_INTERVAL (unless force), otherwise revalidated with
+    If-None-Match. A 304 (or any failure) keeps the cached payload.
+    """
+    cached = state.get("release")
+    now = time.time()
+    if cached and not force and now - state.get("checked", 0) < MIN_RECHECK_INTERVAL:
+        return cached
+
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if cached and state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    try:
+        resp = http_client.get(GITHUB_API, timeout=8, headers=headers)
+    except Exception:
+        return cached
+
+    if resp.status_code == 304 and cached:
+        state["checked"] = now
+    elif resp.status_code == 200:
+        state["release"] = cached = _slim_release(resp.json())
+        state["etag"] = resp.headers.get("ETag")
+        state["checked"] = now
+    else:
+        return cached   # rate limited / server error: answer from the cache, retry next time
+    _save_state(state)
+    return cached
+
+
+def check_for_update(force: bool = False) -> dict | None:
     """
     Checks for the latest version from GitHub Releases API.
     If a new version exists, returns a dict:
       {"version": "2.4", "download_url": "...", "size": 12345, "notes": "..."}
     Otherwise returns None.
+
+    The last release payload is persisted with its ETag, so within
+    MIN_RECHECK_INTERVAL this makes no request at all and afterwards a
+    conditional one (a 304 costs no rate limit). force=True (manual check)
+    skips the interval but still sends If-None-Match.
     """
     try:
-        resp = requests.get(GITHUB_API, timeout=8, headers={
-            "Accept": "application/vnd.github.v3+json"
-        })
-        if resp.status_code != 200:
-            return None
+        data = _fetch_release(_load_state(), force)
+        return _release_to_update(data) if data else None
+    except Exception:
+        return None
 
-        data = resp.json()
-        tag = data.get("tag_name", "")
-        if not tag:
-            return None
-        
-        latest = _parse_version(tag)
-        current = _parse_version(CURRENT_VERSION)
-        
-        # If parsing fails, returns (0,0,0), ignore update in this case
-        if latest == (0, 0, 0) or current == (0, 0, 0):
-            return None
 
-        # Compare versions - if equal or older, no update available
-        if _compare_versions(latest, current) <= 0:
-            return None
+def _release_to_update(data: dict) -> dict | None:
+    """Update dict for a release payload, or None if it is not newer than this build."""
+    tag = data.get("tag_name", "")
+    if not tag:
+        return None
+
+    latest = _parse_version(tag)
+    current = _parse_version(CURRENT_VERSION)
+
+    # If parsing fails, returns (0,0,0), ignore update in this case
+    if latest == (0, 0, 0) or current == (0, 0, 0):
+        return None
 
-        # Find Setup EXE
-        download_url = None
-        file_size = 0
+    # Compare versions - if equal or older, no update available
+    if _compare_versions(latest, current) <= 0:
+        return None
+
+    # Find Setup EXE
+    download_url = None
+    file_size = 0
+    for asset in data.get("assets", []):
+        name = asset.get("name", "").lower()
+        if "setup" in name and name.endswith(".exe"):
+            download_url = asset.get("browser_download_url")
+            file_size = asset.get("size", 0)
+            break
+
+    if not download_url:
+        # If Setup missing, take any exe
         for asset in data.get("assets", []):
-            name = asset.get("name", "").lower()
-            if "setup" in name and name.endswith(".exe"):
+            if asset.get("name", "").lower().endswith(".exe"):
                 download_url = asset.get("browser_download_url")
                 file_size = asset.get("size", 0)
                 break
 
-        if not download_url:
-            # If Setup missing, take any exe
-            for asset in data.get("assets", []):
-                if asset.get("name", "").lower().endswith(".exe"):
-                    download_url = asset.get("browser_download_url")
-                    file_size = asset.get("size", 0)
-                    break
+    if not download_url:
+        return None
+
+    # Delta from this build's installer, e.g. GameInSteam_Setup_v5.1_to_v5.2.delta
+    delta_url, delta_size = None, 0
+    for asset in data.get("assets", []):
+        m = _DELTA_RE.search(asset.get("name", ""))
+        if m and _parse_version(m.group(1)) == current and _parse_version(m.group(2)) == latest:
+            delta_url, delta_size = asset.get("browser_download_url"), asset.get("size", 0)
+            break
+
+    filename = os.path.basename(download_url)
+    known = data.get("sha256") or {}
+    sha256 = known[filename] if filename in known else _find_sha256(data, filename)
+
+    # Clean version string
+    version_str = tag.strip().lstrip("vV")
+    # Take only numeric characters and dots
+    version_clean = ""
+    for char in version_str:
+        if char.isdigit() or char == ".":
+            version_clean += char
+        else:
+            break
+    if not version_clean:
+        version_clean = tag.lstrip("vV")
+
+    return {
+        "version": version_clean,
+        "download_url": download_url,
+        "size": file_size,
+        "notes": data.get("body", ""),
+        "filename": filename,
+        "sha256": sha256,
+        "delta_url": delta_url,
+        "delta_size": delta_size,
+    }
 
-        if not download_url:
-            return None
 
-        # Clean version string
-        version_str = tag.strip().lstrip("vV")
-        # Take only numeric characters and dots
-        version_clean = ""
-        for char in version_str:
-            if char.isdigit() or char == ".":
-                version_clean += char
-            else:
+_SHA256_RE = re.compile(r"\b([a-fA-F0-9]{64})\b")
+
+
+def _find_sha256(release: dict, filename: str) -> str | None:
+    """
+    Expected SHA-256 of the installer, from (in order):
+    the asset's "digest" field, a <file>.sha256 / SHA256SUMS asset, or a
+    line in the release notes that mentions the file name.
+    """
+    assets = release.get("assets", [])
+    for asset in assets:
+        digest = asset.get("digest") or ""
+        if asset.get("name") == filename and digest.startswith("sha256:"):
+            return digest[7:].lower()
+
+    for asset in assets:
+        name = asset.get("name", "")
+        if name.lower() in (f"{filename.lower()}.sha256", "sha256sums", "sha256sums.txt"):
+            try:
+                resp = http_client.get(asset.get("browser_download_url"), timeout=8)
+                if resp.status_code != 200:
+                    continue
+                for line in resp.text.splitlines():
+                    m = _SHA256_RE.search(line)
+                    if m and (filename in line or name.lower().endswith(".sha256")):
+                        return m.group(1).lower()
+            except Exception:
+                pass
+
+    for line in (release.get("body") or "").splitlines():
+        m = _SHA256_RE.search(line)
+        if m and filename.lower() in line.lower():
+            return m.group(1).lower()
+    return None
+
+
+def _hash_file(path: str):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest
+
+
+def _content_total(resp, offset: int) -> int:
+    """Full file size from Content-Range (206) or Content-Length (200)."""
+    cr = resp.headers.get("content-range", "")
+    if "/" in cr and cr.rsplit("/", 1)[1].isdigit():
+        return int(cr.rsplit("/", 1)[1])
+    length = int(resp.headers.get("content-length", 0) or 0)
+    return offset + length if length else 0
+
+
+def download_update(url: str, on_progress=None, sha256: str | None = None,
+                    dest_dir: str | None = None, max_rate: int | None = None,
+                    stop: threading.Event | None = None) -> str | None:
+    """
+    Downloads update file.
+    on_progress(downloaded_bytes, total_bytes) callback reports progress
+    (at most every PROGRESS_INTERVAL seconds, plus once at the end).
+    Returns the path of the downloaded file, or None.
+
+    The file is written to <name>.part and resumed with an HTTP Range request
+    after a dropped connection (or on the next call), so bytes already on
+    disk are never transferred twice. The SHA-256 is computed while
+    streaming; if sha256 is given and does not match, the file is deleted.
+
+    max_rate caps the transfer in bytes/s; setting stop ends the download
+    early (returns None, the .part is kept for the next call). Only one
+    download runs at a time — a second caller waits and then resumes.
+    """
+    with _download_lock:
+        return _download(url, on_progress, sha256, dest_dir, max_rate, stop)
+
+
+def _download(url, on_progress, sha256, dest_dir, max_rate, stop) -> str | None:
+    filename = url.split("/")[-1]
+    filepath = os.path.join(dest_dir or tempfile.gettempdir(), filename)
+    part = filepath + ".part"
+    meta_path = part + ".json"
+    expected = sha256.lower() if sha256 else None
+
+    if expected and os.path.isfile(filepath) and _hash_file(filepath).hexdigest() == expected:
+        return filepath   # already downloaded and verified
+
+    # A partial file is only resumed if it belongs to the same URL / digest
+    meta = {}
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        pass
+    if meta.get("url") != url or meta.get("sha256") != expected:
+        meta = {"url": url, "sha256": expected}
+        for p in (part, meta_path):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+    offset = os.path.getsize(part) if os.path.isfile(part) else 0
+    digest = _hash_file(part) if offset else hashlib.sha256()
+    total = 0
+    failures = 0
+    last_report = 0.0
+    stop = stop or threading.Event()
+
+    while not stop.is_set():
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if meta.get("etag"):
+                headers["If-Range"] = meta["etag"]
+        try:
+            with http_client.get(url, stream=True, timeout=30, headers=headers) as resp:
+                if resp.status_code == 416:     # range past the end: .part is complete (or foreign)
+                    total = _content_total(resp, 0)
+                    if total and offset >= total:
+                        break
+                    offset, digest = 0, hashlib.sha256()
+                    os.remove(part)
+                    continue
+                if resp.status_code == 206:
+                    mode = "ab"
+                elif resp.status_code == 200:
+                    mode, offset, digest = "wb", 0, hashlib.sha256()   # no/ignored Range: restart
+                else:
+                    return None
+                total = _content_total(resp, offset)
+                etag = resp.headers.get("ETag")
+                if etag and etag != meta.get("etag"):
+                    meta["etag"] = etag
+                    _atomic_write_json(meta_path, meta)
+
+                started, received = time.monotonic(), 0
+                with open(part, mode) as f:
+                    for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK):
+                        if stop.is_set():
+                            return None
+                        if not chunk:
+                            continue
+                        f.write(chunk)
+                        digest.update(chunk)
+                        offset += len(chunk)
+                        received += len(chunk)
+                        failures = 0
+                        now = time.monotonic()
+                        if max_rate and received / max_rate > now - started:
+                            stop.wait(received / max_rate - (now - started))
+                        if on_progress and total > 0 and now - last_report >= PROGRESS_INTERVAL:
+                            last_report = now
+                            on_progress(offset, total)
+            if not total or offset >= total:
                 break
-        if not version_clean:
-            version_clean = tag.lstrip("vV")
-        
-        return {
-            "version": version_clean,
-            "download_url": download_url,
-            "size": file_size,
-            "notes": data.get("body", ""),
-            "filename": os.path.basename(download_url),
-        }
+        except Exception:
+            pass
+        failures += 1
+        if failures > DOWNLOAD_RETRIES:
+            return None   # .part stays on disk; the next call resumes from it
+        stop.wait(min(2 ** failures, 15))
+    if stop.is_set():
+        return None
+
+    if on_progress and total > 0:
+        on_progress(offset, total)
+
+    if expected and digest.hexdigest() != expected:
+        print(f"Update verification failed: SHA-256 mismatch for {filename}")
+        for p in (part, meta_path):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+        return None
+
+    try:
+        os.replace(part, filepath)
+    except OSError:
+        return None
+    try:
+        os.remove(meta_path)
+    except OSError:
+        pass
+    return filepath
+
+
+def update_cache_dir() -> str:
+    path = os.path.join(get_app_data_dir(), UPDATE_CACHE_SUBDIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _is_verified(path: str, info: dict) -> bool:
+    """SHA-256 match. Without a published hash a file is never considered verified."""
+    if not info.get("sha256") or not os.path.isfile(path):
+        return False
+    return _hash_file(path).hexdigest() == info["sha256"].lower()
+
+
+def staged_update(info: dict) -> str | None:
+    """Path of an already downloaded and verified installer for info, or None."""
+    try:
+        path = os.path.join(update_cache_dir(), info["filename"])
+        return path if _is_verified(path, info) else None
     except Exception:
         return None
 
 
-def download_update(url: str, on_progress=None) -> str | None:
+def _installer_version(filename: str) -> tuple | None:
+    m = _INSTALLER_VERSION_RE.search(filename)
+    return _parse_version(m.group(1)) if m else None
+
+
+def _local_installer(folder: str) -> str | None:
+    """This build's own installer in the update cache (the base for deltas)."""
+    current = _parse_version(CURRENT_VERSION)
+    for entry in os.listdir(folder):
+        if _installer_version(entry) == current:
+            return os.path.join(folder, entry)
+    return None
+
+
+def _prune_update_cache(keep: str):
+    """Drops installers (and partial downloads) of other releases, except this build's own."""
+    folder = os.path.dirname(keep)
+    name = os.path.basename(keep)
+    current = _parse_version(CURRENT_VERSION)
+    for entry in os.listdir(folder):
+        if entry == name or entry.startswith(name + ".part") or _installer_version(entry) == current:
+            continue
+        try:
+            os.remove(os.path.join(folder, entry))
+        except OSError:
+            pass
+
+
+def _delta_update(info: dict, folder: str, on_progress, max_rate, stop) -> str | None:
     """
-    Downloads update file.
-    on_progress(downloaded_bytes, total_bytes) callback reports progress.
-    Returns the path of the downloaded file.
+    Downloads the release's delta and rebuilds the installer from this build's
+    cached one. Returns the verified installer path, or None (no base,
+    download failed, or the result does not hash to info["sha256"]).
     """
+    base = _local_installer(folder)
+    if not base or not info.get("delta_url") or not info.get("sha256"):
+        return None
+    from delta_patch import apply_delta, DeltaError   # only needed when a delta is published
+    delta = download_update(info["delta_url"], on_progress, None, folder,
+                            max_rate=max_rate, stop=stop)
+    if not delta:
+        return None
+    target = os.path.join(folder, info["filename"])
+    rebuilt = target + ".rebuild"
     try:
-        resp = requests.get(url, stream=True, timeout=30)
-        if resp.status_code != 200:
+        if apply_delta(base, delta, rebuilt) != info["sha256"].lower():
+            print(f"Delta update rejected: SHA-256 mismatch for {info['filename']}")
             return None
+        os.replace(rebuilt, target)
+        return target
+    except (OSError, DeltaError) as e:
+        print(f"Delta update failed: {e}")
+        return None
+    finally:
+        for p in (rebuilt, delta):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+def fetch_update(info: dict, on_progress=None, max_rate: int | None = None,
+                 stop: threading.Event | None = None) -> str | None:
+    """
+    Verified installer for info in the update cache: the staged one, else
+    rebuilt from a delta, else the full download. Returns its path or None.
+    Installers of other releases are pruned once the path is known.
+    """
+    path = staged_update(info)
+    if not path:
+        folder = update_cache_dir()
+        path = _delta_update(info, folder, on_progress, max_rate, stop)
+        if not path and not (stop is not None and stop.is_set()):
+            path = download_update(info["download_url"], on_progress, info.get("sha256"),
+                                   folder, max_rate=max_rate, stop=stop)
+    if path:
+        _prune_update_cache(path)
+    return path
 
-        total = int(resp.headers.get("content-length", 0))
-        temp_dir = tempfile.gettempdir()
-        filename = url.split("/")[-1]
-        filepath = os.path.join(temp_dir, filename)
-
-        downloaded = 0
-        with open(filepath, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=65536):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if on_progress and total > 0:
-                        on_progress(downloaded, total)
-
-        return filepath
+
+@contextmanager
+def _background_priority():
+    """Windows background mode for the calling thread (lower CPU and I/O priority)."""
+    try:
+        from ctypes import windll  # type: ignore
+        k32 = windll.kernel32
+        k32.SetThreadPriority(k32.GetCurrentThread(), 0x00010000)   # THREAD_MODE_BACKGROUND_BEGIN
     except Exception:
+        k32 = None
+    try:
+        yield
+    finally:
+        if k32 is not None:
+            k32.SetThreadPriority(k32.GetCurrentThread(), 0x00020000)   # THREAD_MODE_BACKGROUND_END
+
+
+def prefetch_update(info: dict, stop: threading.Event | None = None,
+                    max_rate: int | None = PREFETCH_MAX_RATE) -> str | None:
+    """
+    Background pre-download of the installer into the update cache, capped at
+    max_rate and at background thread priority. Returns the staged path once
+    verified (see staged_update), or None if it failed or was stopped.
+    Releases without a published SHA-256 are never staged.
+    """
+    if not info.get("sha256"):
         return None
+    try:
+        with _background_priority():
+            path = fetch_update(info, max_rate=max_rate, stop=stop)
+        if path and _is_verified(path, info):
+            return path
+    except Exception:
+        pass
+    return None
 
 
 def apply_update(installer_path: str):
@@ -0,0 +1,140 @@
+"""
+GameInSteam — Virtualized list
+Scrollable list that only builds widgets for the rows in the viewport (plus a
+small overscan) and recycles them while scrolling, so the cost of rendering
+stays flat no matter how many items the list holds.
+"""
+
+import math
+import tkinter as tk
+
+import customtkinter as ctk  # type: ignore
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Fixed-height rows drawn as canvas windows over a tall scroll region.
+
+    create_row(parent) -> widget        builds one reusable row (called rarely)
+    bind_row(widget, index, item)       fills a row for the given item (called on scroll)
+
+    Only ceil(viewport / row_height) + 2 * overscan rows ever exist.
+    """
+
+    def __init__(self, master, row_height: int, create_row, bind_row,
+                 overscan: int = 3, row_gap: int = 10, bg: str = "#FFFFFF",
+                 scrollbar_button_color: str | None = None,
+                 scrollbar_button_hover_color: str | None = None, **kw):
+        super().__init__(master, fg_color="transparent", **kw)
+        self.row_height = row_height
+        self.row_gap = row_gap
+        self.overscan = overscan
+        self._create_row = create_row
+        self._bind_row = bind_row
+        self._items: list = []
+        self._pool: list[tuple[int, tk.Widget]] = []   # (canvas item id, widget)
+        self._bound: dict[int, int] = {}               # pool slot -> item index
+        self._width = 1
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=bg,
+                                yscrollincrement=20)
+        self.scrollbar = ctk.CTkScrollbar(
+            self, command=self._on_scrollbar,
+            button_color=scrollbar_button_color,
+            button_hover_color=scrollbar_button_hover_color)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.bind_all("<MouseWheel>", self._on_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_wheel, add="+")
+
+    # ── public API ───────────────────────────────────────────────────────────
+    def set_items(self, items, keep_scroll: bool = False):
+        self._items = list(items)
+        self.canvas.configure(scrollregion=(0, 0, self._width, len(self._items) * self.row_height))
+        if not keep_scroll:
+            self.canvas.yview_moveto(0)
+        self._bound.clear()
+        self._layout()
+
+    @property
+    def items(self) -> list:
+        return self._items
+
+    def visible_range(self) -> tuple[int, int]:
+        """[start, end) of the item indexes currently inside the viewport."""
+        top = self.canvas.canvasy(0)
+        height = max(1, self.canvas.winfo_height())
+        start = max(0, int(top // self.row_height))
+        end = min(len(self._items), int(math.ceil((top + height) / self.row_height)))
+        return start, end
+
+    def refresh(self, predicate=None):
+        """Re-binds visible rows (all, or those whose item matches predicate)."""
+        for slot, idx in list(self._bound.items()):
+            if idx < len(self._items) and (predicate is None or predicate(self._items[idx])):
+                self._bind_row(self._pool[slot][1], idx, self._items[idx])
+
+    # ── internals ────────────────────────────────────────────────────────────
+    def _ensure_pool(self):
+        height = max(1, self.canvas.winfo_height())
+        needed = int(math.ceil(height / self.row_height)) + 1 + 2 * self.overscan
+        while len(self._pool) < needed:
+            widget = self._create_row(self.canvas)
+            item_id = self.canvas.create_window(
+                0, -self.row_height * 2, anchor="nw", window=widget,
+                width=self._width, height=self.row_height - self.row_gap)
+            self._pool.append((item_id, widget))
+
+    def _layout(self):
+        self._ensure_pool()
+        start, _ = self.visible_range()
+        first = max(0, start - self.overscan)
+        wanted = list(range(first, min(len(self._items), first + len(self._pool))))
+
+        # Rows that already show a wanted item stay where they are
+        keep = {idx: slot for slot, idx in self._bound.items() if idx in wanted}
+        free = [slot for slot in range(len(self._pool)) if slot not in keep.values()]
+        bound: dict[int, int] = {}
+        for idx in wanted:
+            slot = keep.get(idx)
+            if slot is None:
+                slot = free.pop()
+                item_id, widget = self._pool[slot]
+                self.canvas.coords(item_id, 0, idx * self.row_height)
+                self._bind_row(widget, idx, self._items[idx])
+            bound[slot] = idx
+        for slot in free:   # park unused rows above the scroll region
+            self.canvas.coords(self._pool[slot][0], 0, -self.row_height * 2)
+        self._bound = bound
+
+    def _on_configure(self, event):
+        if event.width != self._width:
+            self._width = event.width
+            for item_id, _ in self._pool:
+                self.canvas.itemconfigure(item_id, width=self._width)
+            self.canvas.configure(
+                scrollregion=(0, 0, self._width, len(self._items) * self.row_height))
+        self._layout()
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._layout()
+
+    def _on_wheel(self, event):
+        target = self.winfo_containing(event.x_root, event.y_root)
+        while target is not None and target is not self:
+            target = target.master
+        if target is None or not self._items:
+            return
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step * 3, "units")
+        self._layout()